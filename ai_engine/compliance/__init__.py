@@ -476,13 +476,16 @@ class LegalComplianceEngine:
         """
         issues = []
         
+        # Lowercased full text, built once and shared by the checks below
+        all_text = ' '.join(s.content.lower() for s in sections)
+        
         # Check required sections
-        issues.extend(self._check_required_sections(sections, contract_type))
+        issues.extend(self._check_required_sections(sections, contract_type, all_text))
         
         # Check each applicable rule
         applicable_rules = self._get_applicable_rules(contract_type)
         for rule in applicable_rules:
-            rule_issues = self._check_rule(rule, sections, metadata)
+            rule_issues = self._check_rule(rule, sections, metadata, all_text)
             issues.extend(rule_issues)
         
         # Check for one-sided clauses
@@ -504,7 +507,12 @@ class LegalComplianceEngine:
                 applicable.append(rule)
         return applicable
     
-    def _check_required_sections(self, sections: List[Section], contract_type: str) -> List[ComplianceIssue]:
+    def _check_required_sections(
+        self,
+        sections: List[Section],
+        contract_type: str,
+        all_text: Optional[str] = None
+    ) -> List[ComplianceIssue]:
         """Check if all required sections are present."""
         issues = []
         
@@ -512,7 +520,8 @@ class LegalComplianceEngine:
         found_types = {s.section_type for s in sections}
         
         # Check if requisites-like content exists anywhere in text (bank details, INN, etc)
-        all_text = ' '.join(s.content.lower() for s in sections)
+        if all_text is None:
+            all_text = ' '.join(s.content.lower() for s in sections)
         has_requisites_content = any(kw in all_text for kw in ['stir', 'inn', 'банк', 'bank', 'р/с', 'мфо', 'mfo', 'расчетный счет', 'hisob raqam'])
         if has_requisites_content and SectionType.REQUISITES not in found_types:
             found_types.add(SectionType.REQUISITES)
@@ -562,10 +571,13 @@ class LegalComplianceEngine:
         self,
         rule: LegalRule,
         sections: List[Section],
-        metadata: ContractMetadata
+        metadata: ContractMetadata,
+        all_text: Optional[str] = None
     ) -> List[ComplianceIssue]:
         """Check a single rule against the contract."""
         issues = []
+        if all_text is None:
+            all_text = ' '.join(s.content.lower() for s in sections)
         
         # Get relevant section
         if rule.section_type:
@@ -578,13 +590,11 @@ class LegalComplianceEngine:
             
             # For TERM section, check if term info exists anywhere in text
             if not section and rule.section_type == SectionType.TERM:
-                all_text = ' '.join(s.content.lower() for s in sections)
                 if any(kw in all_text for kw in ['amal qiladi', 'muddati', 'действует', 'срок']):
                     return issues  # Term info found in contract text
             
             if not section and rule.check_type == "mandatory":
                 # Soft fallback: if keywords appear anywhere in text, treat as present
-                all_text = ' '.join(s.content.lower() for s in sections)
                 kw_anywhere = any(kw.lower() in all_text for kw in rule.keywords)
                 if kw_anywhere or rule.section_type in {
                     SectionType.REQUISITES,
@@ -796,8 +806,8 @@ class LegalComplianceEngine:
             
             for pattern_category, pattern_info in risky_patterns.items():
                 for pattern in pattern_info['patterns']:
-                    matches = list(re.finditer(pattern, section_content, re.IGNORECASE))
-                    if matches:
+                    # Only existence matters; re caches the compiled pattern
+                    if re.search(pattern, section_content, re.IGNORECASE):
                         # Faqat bitta xatolik har bir pattern category uchun
                         risky_issues.append(ComplianceIssue(
                             issue_type=IssueType.INVALID_CLAUSE,
@@ -56,9 +56,9 @@ class OCRProcessor:
         except Exception:
             self.max_pages = 0
         try:
-            self.ocr_dpi = int(os.environ.get('OCR_DPI', '400'))
+            self.ocr_dpi = int(os.environ.get('OCR_DPI', '300'))
         except Exception:
-            self.ocr_dpi = 400
+            self.ocr_dpi = 300
         # Optional cache directory for OCR results
         self.use_cache = os.environ.get('OCR_CACHE', '1') in ('1', 'true', 'True')
         self.cache_dir = Path(os.environ.get('OCR_CACHE_DIR', 'media/cache/ocr')).resolve()
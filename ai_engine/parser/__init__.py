@@ -12,6 +12,15 @@ from .inn_registry import resolve_inn_name
 
 logger = logging.getLogger(__name__)
 
+# Party/INN regexes used by metadata extraction, compiled once at import.
+# OCR often splits the 9 INN digits with spaces or dashes.
+_INN_SEPARATORS_RE = re.compile(r"[\s–-]")
+_INN_LABEL_RE = re.compile(r"(?i)(?:INN|ИНН)\s*(\d[\s–-]*\d[\s–-]*\d[\s–-]*\d[\s–-]*\d[\s–-]*\d[\s–-]*\d[\s–-]*\d[\s–-]*\d)")
+_INN_LABEL_LOOSE_RE = re.compile(r"(?i)(?:ИНН|INN|STIR)[\s:–-]*(\d[\s–-]*\d[\s–-]*\d[\s–-]*\d[\s–-]*\d[\s–-]*\d[\s–-]*\d[\s–-]*\d[\s–-]*\d)")
+_PARTY_LABEL_A_RE = re.compile(r"(?ims)[“\«]\s*(?:Заказчик|Покупатель|Буюртмачи|Buyurtmachi|Пудратчи|ПУДРАТЧИ)\s*[”\»]")
+_PARTY_LABEL_B_RE = re.compile(r"(?ims)[“\«]\s*(?:Исполнитель|Поставщик|Подрядчик|Ижрочи|Ijrochi|Етказиб\s+берувчи|Etkazib\s+beruvchi|Ёрдамчи\s+Пудратчи|ЁРДАМЧИ\s+ПУДРАТЧИ)\s*[”\»]")
+_QUOTED_ORG_RE = re.compile(r"[“\«]([^”\»\n]{3,200})[”\»]\s+(?:МЧЖ|АЖ|ООО|АО|AJ)")
+
 
 class SectionType(Enum):
     """Contract section types."""
@@ -416,7 +425,7 @@ class ContractParser:
         all_inns = []
         if requisites_text:
             # Try INN label pattern first in requisites
-            inn_from_label = re.findall(r"(?i)(?:INN|ИНН)\s*(\d[\s–-]*\d[\s–-]*\d[\s–-]*\d[\s–-]*\d[\s–-]*\d[\s–-]*\d[\s–-]*\d[\s–-]*\d)", requisites_text)
+            inn_from_label = _INN_LABEL_RE.findall(requisites_text)
             if inn_from_label:
                 all_inns.extend(inn_from_label)
                 logger_local.info(f"[INN_EXTRACT] From requisites INN labels: {inn_from_label}")
@@ -432,7 +441,7 @@ class ContractParser:
         # Normalize INNs (remove spaces/dashes from within)
         normalized_inns = []
         for inn in all_inns:
-            normalized_inn = re.sub(r'[\s–-]', '', inn)  # Remove spaces and dashes
+            normalized_inn = _INN_SEPARATORS_RE.sub('', inn)  # Remove spaces and dashes
             if len(normalized_inn) == 9 and normalized_inn.isdigit():  # Valid 9-digit INN
                 normalized_inns.append(normalized_inn)
                 logger_local.info(f"[INN_EXTRACT] Valid INN: {inn} -> {normalized_inn}")
@@ -460,20 +469,17 @@ class ContractParser:
                 blocks: List[Dict[str, Optional[str]]] = []
                 if not req_text:
                     return blocks
-                # Define label patterns for two blocks
-                label_a = re.compile(r"(?ims)[“\«]\s*(?:Заказчик|Покупатель|Буюртмачи|Buyurtmachi|Пудратчи|ПУДРАТЧИ)\s*[”\»]")
-                label_b = re.compile(r"(?ims)[“\«]\s*(?:Исполнитель|Поставщик|Подрядчик|Ижрочи|Ijrochi|Етказиб\s+берувчи|Etkazib\s+beruvchi|Ёрдамчи\s+Пудратчи|ЁРДАМЧИ\s+ПУДРАТЧИ)\s*[”\»]")
                 # Find all label occurrences with type
                 labels = []
-                for m in label_a.finditer(req_text):
+                for m in _PARTY_LABEL_A_RE.finditer(req_text):
                     labels.append(('A', m.start()))
-                for m in label_b.finditer(req_text):
+                for m in _PARTY_LABEL_B_RE.finditer(req_text):
                     labels.append(('B', m.start()))
                 if not labels:
                     return blocks
                 labels.sort(key=lambda x: x[1])
                 # Find ordered org names with markers across requisites
-                names = [nm.group(1).strip() for nm in re.finditer(r"[“\«]([^”\»\n]{3,200})[”\»]\s+(?:МЧЖ|АЖ|ООО|АО|AJ)", req_text)]
+                names = [nm.group(1).strip() for nm in _QUOTED_ORG_RE.finditer(req_text)]
                 # Pair names to labels by order
                 count = min(len(labels), len(names))
                 for i in range(count):
@@ -481,11 +487,11 @@ class ContractParser:
                     name_val = names[i]
                     # Extract nearest INN after label position within 800 chars
                     seg = req_text[pos:pos+800]
-                    im = re.search(r"(?i)(?:ИНН|INN|STIR)[\s:–-]*(\d[\s–-]*\d[\s–-]*\d[\s–-]*\d[\s–-]*\d[\s–-]*\d[\s–-]*\d[\s–-]*\d[\s–-]*\d)", seg)
+                    im = _INN_LABEL_LOOSE_RE.search(seg)
                     inn_val = None
                     if im:
                         inn_raw = im.group(1)
-                        inn_norm = re.sub(r"[\s–-]", "", inn_raw)
+                        inn_norm = _INN_SEPARATORS_RE.sub("", inn_raw)
                         if len(inn_norm) == 9 and inn_norm.isdigit():
                             inn_val = inn_norm
                     blocks.append({'type': typ, 'name': name_val, 'inn': inn_val})
@@ -502,10 +508,10 @@ class ContractParser:
                     look_start = nm.end()
                     look_end = min(len(req_text), look_start + 500)
                     look = req_text[look_start:look_end]
-                    inn_m = re.search(r"(?i)(?:ИНН|INN|STIR)[\s:–-]*(\d[\s–-]*\d[\s–-]*\d[\s–-]*\d[\s–-]*\d[\s–-]*\d[\s–-]*\d[\s–-]*\d[\s–-]*\d)", look)
+                    inn_m = _INN_LABEL_LOOSE_RE.search(look)
                     if inn_m:
                         inn_raw = inn_m.group(1)
-                        inn_norm = re.sub(r"[\s–-]", "", inn_raw)
+                        inn_norm = _INN_SEPARATORS_RE.sub("", inn_raw)
                         if len(inn_norm) == 9 and inn_norm.isdigit():
                             pairs.append((name, inn_norm))
                 return pairs
@@ -798,10 +804,13 @@ class ContractParser:
         metadata.language = lang
         metadata.language_distribution = lang_dist
         
-        if not metadata.party_a_name:
-            metadata.party_a_name = self._extract_party(text, 'party_a_name')
-        if not metadata.party_b_name:
-            metadata.party_b_name = self._extract_party(text, 'party_b_name')
+        if not (metadata.party_a_name and metadata.party_b_name):
+            # Slice the head/requisites/tail blocks once for both parties
+            party_blocks = self._party_search_blocks(text)
+            if not metadata.party_a_name:
+                metadata.party_a_name = self._extract_party(text, 'party_a_name', party_blocks)
+            if not metadata.party_b_name:
+                metadata.party_b_name = self._extract_party(text, 'party_b_name', party_blocks)
 
         # Final fallback: if names still missing or identical, try INN registry mapping
         try:
@@ -821,8 +830,8 @@ class ContractParser:
 
         return metadata
 
-    def _extract_party(self, text: str, field: str) -> Optional[str]:
-        """Extract party name using defined patterns."""
+    def _party_search_blocks(self, text: str) -> List[str]:
+        """Text blocks searched for party names: intro, requisites section and tail."""
         import logging
         logger = logging.getLogger(__name__)
         
@@ -852,6 +861,15 @@ class ContractParser:
 
         search_blocks.append(text[-50000:])
         logger.info(f"[PARTY_EXTRACT] Total search blocks: {len(search_blocks)}")
+        return search_blocks
+
+    def _extract_party(self, text: str, field: str, search_blocks: Optional[List[str]] = None) -> Optional[str]:
+        """Extract party name using defined patterns."""
+        import logging
+        logger = logging.getLogger(__name__)
+        
+        if search_blocks is None:
+            search_blocks = self._party_search_blocks(text)
 
         for block_idx, search_text in enumerate(search_blocks):
             print(f"[DEBUG PARTY] Block {block_idx+1}/{len(search_blocks)}, length={len(search_text)}, field={field}")
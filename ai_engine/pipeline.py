@@ -4,7 +4,9 @@ Orchestrates all AI components for complete contract analysis.
 """
 
 import logging
+import os
 import time
+from types import SimpleNamespace
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, asdict
 
@@ -36,6 +38,14 @@ class AnalysisConfig:
             self.ocr_languages = ['uzb', 'uzb_latn', 'rus']
 
 
+class _FileContract:
+    """In-memory stand-in for a Contract when analysing a bare file path."""
+
+    def __init__(self, file_path):
+        self.id = os.fspath(file_path)
+        self.original_file = SimpleNamespace(path=self.id)
+
+
 class ContractAnalysisPipeline:
     """
     Main pipeline for contract analysis.
@@ -96,12 +106,16 @@ class ContractAnalysisPipeline:
         Perform complete analysis on a contract.
         
         Args:
-            contract: Contract model instance from Django
+            contract: Contract model instance from Django, or a file path.
+                A path is analysed without touching the database.
             
         Returns:
             Analysis results dictionary
         """
         start_time = time.time()
+        persist = not isinstance(contract, (str, os.PathLike))
+        if not persist:
+            contract = _FileContract(contract)
         t_ocr = t_parse = t_spelling = t_compliance = t_risk = t_rag = 0.0
         
         try:
@@ -115,7 +129,8 @@ class ContractAnalysisPipeline:
             contract.extracted_text = text
             contract.is_scanned = is_scanned
             contract.ocr_confidence = ocr_confidence
-            contract.save()
+            if persist:
+                contract.save()
             
             # Step 2: Parse contract
             logger.info("Parsing contract structure...")
@@ -129,11 +144,12 @@ class ContractAnalysisPipeline:
             # Check if document is a valid contract
             is_valid_contract = self._is_valid_contract(text, metadata, contract_type)
             
-            # Update contract metadata
-            self._update_contract_metadata(contract, metadata, contract_type)
-            
-            # Step 4: Create sections in database
-            self._save_sections(contract, sections)
+            if persist:
+                # Update contract metadata
+                self._update_contract_metadata(contract, metadata, contract_type)
+                
+                # Step 4: Create sections in database
+                self._save_sections(contract, sections)
             
             # If not a valid contract, only check spelling and return early
             if not is_valid_contract:
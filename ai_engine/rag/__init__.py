@@ -4,14 +4,28 @@ Uses vector search to find relevant laws and generate context-aware responses.
 Supports both Ollama (local) and OpenAI (cloud) LLMs.
 """
 
+import hashlib
+import json
 import logging
 import os
+import time
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
 
+def _default_cache_dir() -> Path:
+    """<MEDIA_ROOT>/cache/rag under Django, otherwise backend/media/cache/rag of this checkout."""
+    try:
+        from django.conf import settings
+        if settings.configured:
+            return Path(settings.MEDIA_ROOT) / 'cache' / 'rag'
+    except Exception:
+        pass
+    return Path(__file__).resolve().parents[2] / 'backend' / 'media' / 'cache' / 'rag'
+
+
 
 
 class LegalRAG:
@@ -20,6 +34,19 @@ class LegalRAG:
     Uses ChromaDB for vector storage and LLM for generation.
     Supports Ollama (local) and OpenAI (cloud) as LLM backends.
     """
+
+    # Upper bound for in-process result memos (cleared when exceeded)
+    MEMO_MAX_ENTRIES = 2048
+
+    # Disk cache housekeeping: prune every N writes
+    CACHE_PRUNE_EVERY = 200
+
+    # Part of every LLM cache key: bump when the analysis prompts change
+    PROMPT_VERSION = 1
+
+    # Clauses per batched LLM call; keeps the reply (768 tokens per clause)
+    # within the output limit of every backend
+    BATCH_MAX_CLAUSES = 4
     
     def __init__(
         self,
@@ -66,6 +93,27 @@ class LegalRAG:
         self.llm_type = None  # 'ollama', 'openai', 'gemini', or None
         
         self._initialized = False
+
+        # Result caches keyed by content hash: contracts share a lot of
+        # boilerplate clauses, so repeated searches/LLM calls are common.
+        # With RAG_CACHE=1 (opt-in; the batch script turns it on) LLM results
+        # also go to disk so parallel batch workers share hits. Entries expire
+        # after RAG_CACHE_TTL seconds so law/vector store updates reach
+        # long-running workers; expired and surplus files are pruned on write.
+        self._search_memo: Dict[str, Tuple[float, List[Dict]]] = {}
+        self._result_memo: Dict[str, Tuple[float, object]] = {}
+        self.use_cache = os.environ.get('RAG_CACHE', '0') in ('1', 'true', 'True')
+        self.cache_ttl = float(os.environ.get('RAG_CACHE_TTL', 86400))
+        self.cache_max_files = int(os.environ.get('RAG_CACHE_MAX_FILES', 5000))
+        cache_dir = os.environ.get('RAG_CACHE_DIR')
+        self.cache_dir = Path(cache_dir).resolve() if cache_dir else _default_cache_dir()
+        self._cache_writes = 0
+        if self.use_cache:
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                self._prune_cache()
+            except Exception:
+                self.use_cache = False
     
     def initialize(self):
         """Initialize all components."""
@@ -249,11 +297,20 @@ class LegalRAG:
         Returns:
             Relevant law articles
         """
+        key = self._cache_key('search', query, contract_type, n_results)
+        cached = self._search_memo.get(key)
+        if cached is not None and time.time() - cached[0] <= self.cache_ttl:
+            return cached[1]
+
         filter_dict = None
         if contract_type:
             filter_dict = {"contract_type": contract_type}
         
-        return self.search(query, n_results, filter_dict)
+        results = self.search(query, n_results, filter_dict)
+        if len(self._search_memo) >= self.MEMO_MAX_ENTRIES:
+            self._search_memo.clear()
+        self._search_memo[key] = (time.time(), results)
+        return results
     
     def generate_response(
         self,
@@ -438,6 +495,18 @@ JAVOB:"""
                 'analysis_structured': result,
             }
 
+        cache_key = self._cache_key(
+            'structured', clause_text, contract_type, self._llm_identity(),
+            self.PROMPT_VERSION, self._law_ids(relevant_laws),
+        )
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return {
+                'clause': clause_text,
+                'relevant_laws': relevant_laws,
+                'analysis_structured': cached,
+            }
+
         # Strict JSON-only instruction
         system_prompt = (
             "Siz O'zbekiston qonunchiligi bo'yicha ekspert yuridik yordamchisiz. "
@@ -493,65 +562,8 @@ JAVOB:"""
 
             user_content = f"KONTEKST:\n{context}\n\n{prompt}"
 
-            if self.llm_type == 'ollama':
-                response = self.llm_client.chat(
-                    model=self.llm_model,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_content},
-                    ],
-                    options={"temperature": 0.1, "num_predict": 768},
-                )
-                content = response['message']['content']
-            elif self.llm_type == 'gemini':
-                import time
-                import google.generativeai as genai
-                from google.generativeai.types import HarmCategory, HarmBlockThreshold
-                
-                # Create model with system instruction
-                model = genai.GenerativeModel(
-                    self.gemini_model,
-                    system_instruction=system_prompt
-                )
-                
-                max_retries = 3
-                for attempt in range(max_retries):
-                    try:
-                        response = model.generate_content(
-                            user_content,
-                            generation_config=dict(
-                                temperature=0.1,
-                                max_output_tokens=768,
-                            ),
-                            safety_settings={
-                                HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
-                                HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
-                                HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
-                                HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
-                            }
-                        )
-                        content = response.text
-                        break
-                    except Exception as e:
-                        if "429" in str(e) and attempt < max_retries - 1:
-                            wait_time = (attempt + 1) * 20  # 20s, 40s, 60s
-                            logger.warning(f"Gemini 429 error, retrying in {wait_time}s...")
-                            time.sleep(wait_time)
-                        else:
-                            raise e
-            else:
-                response = self.openai_client.chat.completions.create(
-                    model=self.openai_model,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_content},
-                    ],
-                    temperature=0.1,
-                    max_tokens=768,
-                )
-                content = response.choices[0].message.content
+            content = self._llm_complete(system_prompt, user_content, max_tokens=768)
 
-            import json
             try:
                 data = json.loads(content)
                 # Minimal validation and coercion
@@ -561,6 +573,7 @@ JAVOB:"""
                     'recommendations': list(data.get('recommendations', []))[:6],
                     'rewrite': str(data.get('rewrite', '')),
                 }
+                self._cache_set(cache_key, result)
             except Exception:
                 # Fallback: return raw content mapped into rewrite, minimal fields
                 result = {
@@ -583,6 +596,350 @@ JAVOB:"""
                 'error': str(e),
             }
 
+    def analyze_clauses_batch(self, clauses: List[Tuple[str, str]], contract_type: str = None) -> Dict[str, Dict]:
+        """Structured analysis of several clauses with a single LLM call.
+
+        Args:
+            clauses: (name, clause_text) pairs, e.g. section type and its content
+            contract_type: Type of contract
+
+        Returns:
+            name -> {compliance, risks, recommendations, rewrite}; clauses the
+            model skipped (or all of them, without an LLM) get the heuristic result
+        """
+        if not clauses:
+            return {}
+
+        try:
+            if not self._initialized:
+                self.initialize()
+        except Exception as e:
+            logger.warning(f"RAG initialize failed, continuing with fallback: {e}")
+
+        results = {}
+        cache_keys = {}
+        pending = []
+        for name, clause_text in clauses:
+            if self.llm_type:
+                # Own namespace: the batch prompt and its top-3 law context differ
+                # from analyze_clause_structured, so their answers are not interchangeable
+                cache_keys[name] = self._cache_key(
+                    'structured_batch', clause_text, contract_type, self._llm_identity(),
+                    self.PROMPT_VERSION, self._law_ids(self._clause_laws(clause_text, contract_type)),
+                )
+                cached = self._cache_get(cache_keys[name])
+                if cached is not None:
+                    results[name] = cached
+                    continue
+            pending.append((name, clause_text))
+
+        data = {}
+        for chunk in (self._batches(pending) if self.llm_type else []):
+            relevant_laws = self._search_laws_for_clauses(chunk, contract_type)
+            system_prompt = (
+                "Siz O'zbekiston qonunchiligi bo'yicha ekspert yuridik yordamchisiz. "
+                "Faqat JSON qaytaring; matnli izohlar, prefix/suffix kerak emas."
+            )
+            prompt = (
+                "Quyidagi har bir bandni alohida tahlil qiling va qat'iy JSON qaytaring.\n\n"
+                f"{self._format_clauses(chunk)}\n\n"
+                "Har bir band uchun:\n"
+                "- compliance: 'mos', 'mos emas' yoki 'noaniq'\n"
+                "- risks: 2-4 aniq punkt\n"
+                "- recommendations: 1-3 amaliy tavsiya\n"
+                "- rewrite: kerak bo'lsa, taklif etilgan band matni\n\n"
+                "Qaytaring faqat quyidagi JSON formatda, kalitlar - band nomlari:\n"
+                "{\n"
+                "  \"<band nomi>\": {\"compliance\": \"mos|mos emas|noaniq\", \"risks\": [\"...\"], "
+                "\"recommendations\": [\"...\"], \"rewrite\": \"...\"}\n"
+                "}"
+            )
+            user_content = f"KONTEKST:\n{self._format_context(relevant_laws)}\n\n{prompt}"
+            try:
+                content = self._llm_complete(system_prompt, user_content, max_tokens=768 * len(chunk))
+                data.update(self._parse_json_object(content))
+            except Exception as e:
+                logger.error(f"Batch clause analysis failed: {e}")
+
+        for name, clause_text in pending:
+            item = data.get(name)
+            if isinstance(item, dict):
+                results[name] = {
+                    'compliance': str(item.get('compliance', 'noaniq')),
+                    'risks': list(item.get('risks', []))[:6],
+                    'recommendations': list(item.get('recommendations', []))[:6],
+                    'rewrite': str(item.get('rewrite', '')),
+                }
+                self._cache_set(cache_keys[name], results[name])
+            else:
+                results[name] = self._heuristic_structured_analysis(clause_text)
+        return {name: results[name] for name, _ in clauses}
+
+    def explain_clauses_batch(self, clauses: List[Tuple[str, str]], contract_type: str = None) -> Dict[str, str]:
+        """Free-text counterpart of analyze_clause for several clauses in one LLM call.
+
+        Returns:
+            name -> analysis text; clauses the model skipped (or every clause of
+            an unparsable reply) are analyzed one by one with analyze_clause
+        """
+        if not clauses:
+            return {}
+
+        try:
+            if not self._initialized:
+                self.initialize()
+        except Exception as e:
+            logger.warning(f"RAG initialize failed, continuing without LLM: {e}")
+
+        results = {}
+        cache_keys = {}
+        pending = []
+        for name, clause_text in clauses:
+            cached = None
+            if self.llm_type:
+                cache_keys[name] = self._cache_key(
+                    'explain', clause_text, contract_type, self._llm_identity(),
+                    self.PROMPT_VERSION, self._law_ids(self._clause_laws(clause_text, contract_type)),
+                )
+                cached = self._cache_get(cache_keys[name])
+            if cached is not None:
+                results[name] = cached
+            else:
+                pending.append((name, clause_text))
+
+        for chunk in self._batches(pending):
+            relevant_laws = self._search_laws_for_clauses(chunk, contract_type)
+
+            query = f"""Quyidagi shartnoma bandlarini O'zbekiston qonunchiligi nuqtai nazaridan alohida-alohida tanqidiy tahlil qiling.
+
+{self._format_clauses(chunk)}
+
+Har bir band uchun:
+1) Moslik: (Mos/Qisman mos/Mos emas) - Aniq yuridik baho.
+2) Xavflar: Ushbu band qanday salbiy oqibatlarga olib kelishi mumkin? (Kamida 2 ta aniq xavf).
+3) Tavsiya: Yuridik jihatdan himoyalangan variantni taklif qiling.
+4) O'zgartirish matni: Bandning yangi, xavfsiz tahriri.
+
+Javobni faqat JSON ko'rinishida qaytaring: kalitlar - band nomlari, qiymatlar - tahlil matni."""
+
+            response = self.generate_response(query, relevant_laws)
+            try:
+                data = self._parse_json_object(response)
+            except Exception:
+                # Model ignored the JSON instruction (or there is no LLM and the reply is a notice)
+                data = {}
+            for name, clause_text in chunk:
+                value = data.get(name)
+                if value in (None, '', [], {}):
+                    # Not answered in the batch reply: analyze this clause on its own
+                    results[name] = self.analyze_clause(clause_text, contract_type)['analysis']
+                    continue
+                results[name] = self._explanation_text(value)
+                if self.llm_type:
+                    self._cache_set(cache_keys[name], results[name])
+        return {name: results[name] for name, _ in clauses}
+
+    def _search_laws_for_clauses(self, clauses: List[Tuple[str, str]], contract_type: str = None) -> List[Dict]:
+        """Retrieve laws for each clause and merge them into one de-duplicated context."""
+        merged = {}
+        for _, clause_text in clauses:
+            for doc in self._clause_laws(clause_text, contract_type):
+                merged.setdefault(doc['id'], doc)
+        return list(merged.values())
+
+    def _clause_laws(self, clause_text: str, contract_type: str = None) -> List[Dict]:
+        """Top laws for one clause in the batch methods (memoized by search_laws)."""
+        try:
+            return self.search_laws(clause_text, contract_type, n_results=3)
+        except Exception as e:
+            logger.warning(f"search_laws failed, continuing with fallback: {e}")
+            return []
+
+    @staticmethod
+    def _law_ids(relevant_laws: List[Dict]) -> str:
+        """Cache-key part for the retrieved context, so a changed law store misses the cache."""
+        return ",".join(sorted(str(doc.get('id', '')) for doc in relevant_laws))
+
+    @classmethod
+    def _batches(cls, clauses: List[Tuple[str, str]]) -> List[List[Tuple[str, str]]]:
+        """Split clauses into groups of at most BATCH_MAX_CLAUSES for one LLM call each."""
+        n = cls.BATCH_MAX_CLAUSES
+        return [clauses[i:i + n] for i in range(0, len(clauses), n)]
+
+    @staticmethod
+    def _format_clauses(clauses: List[Tuple[str, str]]) -> str:
+        return "\n\n".join(f"BAND [{name}]:\n{clause_text}" for name, clause_text in clauses)
+
+    @staticmethod
+    def _format_context(relevant_laws: List[Dict]) -> str:
+        context_lines = []
+        for doc in relevant_laws:
+            law_name = doc.get('metadata', {}).get('law_name') or "Noma'lum"
+            article_number = doc.get('metadata', {}).get('article_number', '')
+            context_lines.append(
+                f"Qonun: {law_name}\nModda: {article_number}\nMatn: {doc['text']}"
+            )
+        return "\n\n".join(context_lines)
+
+    @classmethod
+    def _explanation_text(cls, value) -> str:
+        """Flatten a per-clause explanation the model returned as an object/list into text."""
+        if isinstance(value, str):
+            return value
+        if isinstance(value, dict):
+            return "\n".join(f"{key}: {cls._explanation_text(item)}" for key, item in value.items())
+        if isinstance(value, list):
+            return "; ".join(cls._explanation_text(item) for item in value)
+        return json.dumps(value, ensure_ascii=False)
+
+    @staticmethod
+    def _parse_json_object(content: str) -> Dict:
+        """Parse a JSON object from an LLM reply, tolerating code fences or surrounding text."""
+        start, end = content.find('{'), content.rfind('}')
+        if start == -1 or end < start:
+            raise ValueError("No JSON object in LLM response")
+        data = json.loads(content[start:end + 1])
+        if not isinstance(data, dict):
+            raise ValueError("LLM response is not a JSON object")
+        return data
+
+    def _llm_identity(self) -> str:
+        """Identify the active LLM so cached answers are not reused across backends/models."""
+        model = {
+            'openai': self.openai_model,
+            'gemini': self.gemini_model,
+        }.get(self.llm_type, self.llm_model)
+        return f"{self.llm_type}:{model}"
+
+    @staticmethod
+    def _cache_key(kind: str, text: str, *parts) -> str:
+        """Content-hash key for the result caches."""
+        raw = "\0".join([kind, text or ""] + [str(p) for p in parts])
+        return hashlib.blake2b(raw.encode('utf-8'), digest_size=16).hexdigest()
+
+    def _cache_get(self, key: str):
+        """Look up an LLM result in memory, then on disk; entries older than cache_ttl miss."""
+        now = time.time()
+        memo = self._result_memo.get(key)
+        if memo is not None and now - memo[0] <= self.cache_ttl:
+            return memo[1]
+        if not self.use_cache:
+            return None
+        cache_file = self.cache_dir / f"{key}.json"
+        try:
+            stored_at = cache_file.stat().st_mtime
+            if now - stored_at > self.cache_ttl:
+                return None
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                value = json.load(f)
+        except Exception:
+            return None
+        self._result_memo[key] = (stored_at, value)
+        return value
+
+    def _cache_set(self, key: str, value):
+        """Store an LLM result in memory and (best-effort) on disk."""
+        if len(self._result_memo) >= self.MEMO_MAX_ENTRIES:
+            self._result_memo.clear()
+        self._result_memo[key] = (time.time(), value)
+        if not self.use_cache:
+            return
+        try:
+            tmp_file = self.cache_dir / f"{key}.{os.getpid()}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(value, f, ensure_ascii=False)
+            # Atomic rename so concurrent workers never read a partial file
+            os.replace(tmp_file, self.cache_dir / f"{key}.json")
+        except Exception:
+            return
+        self._cache_writes += 1
+        if self._cache_writes % self.CACHE_PRUNE_EVERY == 0:
+            self._prune_cache()
+
+    def _prune_cache(self):
+        """Delete expired cache files, then the oldest ones beyond cache_max_files."""
+        now = time.time()
+        live = []
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith('.json'):
+                    continue
+                try:
+                    mtime = entry.stat().st_mtime
+                    if now - mtime > self.cache_ttl:
+                        os.remove(entry.path)
+                    else:
+                        live.append((mtime, entry.path))
+                except OSError:
+                    continue  # removed by another worker
+        if len(live) > self.cache_max_files:
+            live.sort()
+            for _, path in live[:len(live) - self.cache_max_files]:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def _llm_complete(self, system_prompt: str, user_content: str, max_tokens: int = 768) -> str:
+        """Send one system+user prompt to the active LLM backend and return the raw reply."""
+        if self.llm_type == 'ollama':
+            response = self.llm_client.chat(
+                model=self.llm_model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_content},
+                ],
+                options={"temperature": 0.1, "num_predict": max_tokens},
+            )
+            content = response['message']['content']
+        elif self.llm_type == 'gemini':
+            import google.generativeai as genai
+            from google.generativeai.types import HarmCategory, HarmBlockThreshold
+            
+            # Create model with system instruction
+            model = genai.GenerativeModel(
+                self.gemini_model,
+                system_instruction=system_prompt
+            )
+            
+            max_retries = 3
+            for attempt in range(max_retries):
+                try:
+                    response = model.generate_content(
+                        user_content,
+                        generation_config=dict(
+                            temperature=0.1,
+                            max_output_tokens=max_tokens,
+                        ),
+                        safety_settings={
+                            HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
+                            HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
+                            HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
+                            HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
+                        }
+                    )
+                    content = response.text
+                    break
+                except Exception as e:
+                    if "429" in str(e) and attempt < max_retries - 1:
+                        wait_time = (attempt + 1) * 20  # 20s, 40s, 60s
+                        logger.warning(f"Gemini 429 error, retrying in {wait_time}s...")
+                        time.sleep(wait_time)
+                    else:
+                        raise e
+        else:
+            response = self.openai_client.chat.completions.create(
+                model=self.openai_model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_content},
+                ],
+                temperature=0.1,
+                max_tokens=max_tokens,
+            )
+            content = response.choices[0].message.content
+        return content
+
     def _heuristic_structured_analysis(self, clause_text: str) -> Dict:
         """Lightweight, rule-based fallback when no LLM backend is available.
 
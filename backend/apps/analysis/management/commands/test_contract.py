@@ -5,10 +5,9 @@ Place in: backend/apps/analysis/management/commands/
 """
 
 from django.core.management.base import BaseCommand
-from django.core.files import File
-from apps.contracts.models import Contract
 from ai_engine.pipeline import ContractAnalysisPipeline, AnalysisConfig
 import os
+from collections import Counter
 
 
 class Command(BaseCommand):
@@ -16,6 +15,11 @@ class Command(BaseCommand):
 
     def add_arguments(self, parser):
         parser.add_argument('contract_file', type=str, help='Path to contract file')
+        parser.add_argument(
+            '--save-to-db',
+            action='store_true',
+            help='Create a Contract record and save sections (default: analyse the file path only)',
+        )
 
     def handle(self, *args, **options):
         file_path = options['contract_file']
@@ -29,21 +33,26 @@ class Command(BaseCommand):
         self.stdout.write(f"Fayl: {os.path.basename(file_path)}")
         self.stdout.write("="*80)
         
-        # Create contract
-        with open(file_path, 'rb') as f:
-            filename = os.path.basename(file_path)
-            ext = os.path.splitext(filename)[1].lower().lstrip('.') or 'pdf'
-            size = os.path.getsize(file_path)
-            contract = Contract.objects.create(
-                title=filename,
-                contract_type='other',
-                original_file=File(f, name=filename),
-                original_filename=filename,
-                file_type=ext,
-                file_size=size,
-            )
-        
-        self.stdout.write(self.style.SUCCESS(f'✓ Shartnoma yaratildi: {contract.id}'))
+        contract = None
+        if options['save_to_db']:
+            from django.core.files import File
+            from apps.contracts.models import Contract
+
+            # Create contract
+            with open(file_path, 'rb') as f:
+                filename = os.path.basename(file_path)
+                ext = os.path.splitext(filename)[1].lower().lstrip('.') or 'pdf'
+                size = os.path.getsize(file_path)
+                contract = Contract.objects.create(
+                    title=filename,
+                    contract_type='other',
+                    original_file=File(f, name=filename),
+                    original_filename=filename,
+                    file_type=ext,
+                    file_size=size,
+                )
+            
+            self.stdout.write(self.style.SUCCESS(f'✓ Shartnoma yaratildi: {contract.id}'))
         
         # Run analysis
         config = AnalysisConfig(
@@ -56,7 +65,8 @@ class Command(BaseCommand):
         pipeline = ContractAnalysisPipeline(config)
         
         try:
-            result = pipeline.analyze(contract)
+            # Without --save-to-db the pipeline reads the file path directly
+            result = pipeline.analyze(contract if contract is not None else file_path)
             
             self.stdout.write("\n" + "="*80)
             self.stdout.write("TAHLIL NATIJALARI")
@@ -76,10 +86,7 @@ class Command(BaseCommand):
             self.stdout.write(f"\n📋 Topilgan muammolar: {len(issues)}")
             
             # Group by severity
-            by_severity = {}
-            for issue in issues:
-                sev = issue.get('severity', 'unknown')
-                by_severity[sev] = by_severity.get(sev, 0) + 1
+            by_severity = Counter(issue.get('severity', 'unknown') for issue in issues)
             
             if by_severity:
                 self.stdout.write(f"\n   Darajalar bo'yicha:")
@@ -99,11 +106,13 @@ class Command(BaseCommand):
                     self.stdout.write(f"      → {desc}")
             
             # Cleanup
-            contract.delete()
-            self.stdout.write(self.style.SUCCESS(f'\n✓ Test shartnoma o\'chirildi'))
+            if contract is not None:
+                contract.delete()
+                self.stdout.write(self.style.SUCCESS(f'\n✓ Test shartnoma o\'chirildi'))
             
         except Exception as e:
             self.stdout.write(self.style.ERROR(f'\n❌ XATOLIK: {e}'))
             import traceback
             traceback.print_exc()
-            contract.delete()
+            if contract is not None:
+                contract.delete()
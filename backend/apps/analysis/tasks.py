@@ -4,6 +4,7 @@ Celery tasks for contract analysis.
 
 import time
 import logging
+from functools import lru_cache
 from celery import shared_task
 from celery.exceptions import SoftTimeLimitExceeded
 from django.utils import timezone
@@ -11,6 +12,13 @@ from django.utils import timezone
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _get_pipeline():
+    """Build the AI pipeline once per worker process and reuse it across tasks."""
+    from ai_engine.pipeline import ContractAnalysisPipeline
+    return ContractAnalysisPipeline()
+
+
 @shared_task(bind=True, max_retries=3, soft_time_limit=1200, time_limit=1500)
 def analyze_contract_task(self, contract_id: str):
     """
@@ -18,7 +26,6 @@ def analyze_contract_task(self, contract_id: str):
     """
     from apps.contracts.models import Contract
     from apps.analysis.models import AnalysisResult
-    from ai_engine.pipeline import ContractAnalysisPipeline
     
     logger.info(f"[CELERY] Task started for contract: {contract_id}")
     
@@ -43,7 +50,7 @@ def analyze_contract_task(self, contract_id: str):
         
         # Initialize AI pipeline
         logger.info(f"[CELERY] Initializing AI pipeline...")
-        pipeline = ContractAnalysisPipeline()
+        pipeline = _get_pipeline()
         
         # Run analysis
         logger.info(f"[CELERY] Running pipeline.analyze()...")
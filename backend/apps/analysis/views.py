@@ -66,7 +66,8 @@ class AnalysisResultViewSet(viewsets.ReadOnlyModelViewSet):
         # Check if contract exists and user has access
         from apps.contracts.models import Contract
         try:
-            contract = Contract.objects.get(id=contract_id)
+            # Only the PK is needed here; skip the wide text columns
+            contract = Contract.objects.only('id').get(id=contract_id)
         except Contract.DoesNotExist:
             return Response(
                 {'error': 'Shartnoma topilmadi'},
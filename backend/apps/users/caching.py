@@ -0,0 +1,32 @@
+"""
+Response caching helpers for Users app.
+
+Cached entries embed a generation stamp; bumping it (see signals.py)
+invalidates every cached user/activity response at once. This avoids
+key-pattern deletes, which Django's built-in RedisCache does not support.
+"""
+
+import time
+
+from django.core.cache import cache
+
+USERS_CACHE_TIMEOUT = 60 * 15  # 15 minutes
+GENERATION_KEY = 'users_cache_generation'
+
+
+def _generation():
+    return cache.get_or_set(GENERATION_KEY, time.time_ns(), timeout=None)
+
+
+def make_cache_key(prefix, request, *parts):
+    """Build a per-requesting-user cache key for a read endpoint."""
+    extra = '_'.join(str(p) for p in parts)
+    return (
+        f"{prefix}_{_generation()}_{request.user.pk}_{extra}_"
+        f"{request.query_params.urlencode()}"
+    )
+
+
+def invalidate_users_cache():
+    """Invalidate all cached user and activity responses."""
+    cache.set(GENERATION_KEY, time.time_ns(), timeout=None)
@@ -147,7 +147,7 @@ class UserActivity(models.Model):
     ip_address = models.GenericIPAddressField('IP manzil', null=True, blank=True)
     user_agent = models.TextField('User Agent', blank=True)
     metadata = models.JSONField('Qo\'shimcha ma\'lumotlar', default=dict, blank=True)
-    created_at = models.DateTimeField('Vaqt', auto_now_add=True)
+    created_at = models.DateTimeField('Vaqt', auto_now_add=True, db_index=True)
     
     class Meta:
         verbose_name = 'Foydalanuvchi faoliyati'
@@ -0,0 +1,29 @@
+"""
+Signals for Users app.
+"""
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .caching import invalidate_users_cache
+from .models import UserActivity
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, update_fields=None, **kwargs):
+    """Invalidate cached user responses when a user changes."""
+    # Login only touches last_login, which is not exposed by the API
+    if update_fields and set(update_fields) == {'last_login'}:
+        return
+    invalidate_users_cache()
+
+
+@receiver(post_delete, sender=User)
+@receiver(post_save, sender=UserActivity)
+@receiver(post_delete, sender=UserActivity)
+def users_data_changed(sender, instance, **kwargs):
+    """Invalidate cached user/activity responses."""
+    invalidate_users_cache()
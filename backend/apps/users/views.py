@@ -4,6 +4,7 @@ Views for Users app.
 
 from rest_framework import generics, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.pagination import CursorPagination
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework_simplejwt.views import TokenObtainPairView
@@ -20,6 +21,7 @@ from .serializers import (
     PasswordResetConfirmSerializer,
 )
 from .models import UserActivity
+from .caching import USERS_CACHE_TIMEOUT, invalidate_users_cache, make_cache_key
 import secrets
 from django.core.cache import cache
 from django.core.mail import send_mail
@@ -196,29 +198,57 @@ class UserViewSet(viewsets.ModelViewSet):
             return User.objects.filter(organization=user.organization)
         return User.objects.filter(id=user.id)
     
+    def list(self, request, *args, **kwargs):
+        cache_key = make_cache_key('users_list', request)
+        data = cache.get(cache_key)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            cache.set(cache_key, data, timeout=USERS_CACHE_TIMEOUT)
+        return Response(data)
+    
+    def retrieve(self, request, *args, **kwargs):
+        cache_key = make_cache_key('user_profile', request, kwargs.get('pk'))
+        data = cache.get(cache_key)
+        if data is None:
+            data = super().retrieve(request, *args, **kwargs).data
+            cache.set(cache_key, data, timeout=USERS_CACHE_TIMEOUT)
+        return Response(data)
+    
     @action(detail=True, methods=['post'])
     def activate(self, request, pk=None):
         """Activate user account."""
         user = self.get_object()
-        user.is_active = True
-        user.save()
+        # Single-column UPDATE; bypasses post_save, so invalidate explicitly
+        User.objects.filter(pk=user.pk).update(is_active=True)
+        invalidate_users_cache()
         return Response({'message': 'Foydalanuvchi faollashtirildi'})
     
     @action(detail=True, methods=['post'])
     def deactivate(self, request, pk=None):
         """Deactivate user account."""
         user = self.get_object()
-        user.is_active = False
-        user.save()
+        # Single-column UPDATE; bypasses post_save, so invalidate explicitly
+        User.objects.filter(pk=user.pk).update(is_active=False)
+        invalidate_users_cache()
         return Response({'message': 'Foydalanuvchi o\'chirildi'})
     
     @action(detail=True, methods=['get'])
     def activities(self, request, pk=None):
         """Get user activity history."""
-        user = self.get_object()
-        activities = UserActivity.objects.filter(user=user)[:50]
-        serializer = UserActivitySerializer(activities, many=True)
-        return Response(serializer.data)
+        cache_key = make_cache_key('user_activities', request, pk)
+        data = cache.get(cache_key)
+        if data is None:
+            user = self.get_object()
+            activities = UserActivity.objects.filter(user=user).select_related('user')[:50]
+            data = UserActivitySerializer(activities, many=True).data
+            cache.set(cache_key, data, timeout=USERS_CACHE_TIMEOUT)
+        return Response(data)
+
+
+class _CursorByCreated(CursorPagination):
+    """Keyset pagination for the activity log (no COUNT(*) per page)."""
+    ordering = '-created_at'
+    page_size = 20
 
 
 class UserActivityViewSet(viewsets.ReadOnlyModelViewSet):
@@ -226,11 +256,21 @@ class UserActivityViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = UserActivity.objects.all()
     serializer_class = UserActivitySerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = _CursorByCreated
     filterset_fields = ['user', 'action']
     ordering_fields = ['created_at']
     
     def get_queryset(self):
         user = self.request.user
+        queryset = UserActivity.objects.select_related('user')
         if user.is_admin:
-            return UserActivity.objects.all()
-        return UserActivity.objects.filter(user=user)
+            return queryset
+        return queryset.filter(user=user)
+    
+    def list(self, request, *args, **kwargs):
+        cache_key = make_cache_key('activities_list', request)
+        data = cache.get(cache_key)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            cache.set(cache_key, data, timeout=USERS_CACHE_TIMEOUT)
+        return Response(data)
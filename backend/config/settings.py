@@ -103,11 +103,16 @@ DATABASES = {
         'PASSWORD': env('DB_PASSWORD', default='postgres'),
         'HOST': env('DB_HOST', default='localhost'),
         'PORT': env('DB_PORT', default='5432'),
+        # Reuse connections across requests instead of reconnecting each time
+        'CONN_MAX_AGE': env.int('DB_CONN_MAX_AGE', default=600),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
-# Cache - Use LocMemCache for development, Redis for production
-if DEBUG:
+# Cache - Redis in every environment so cached API responses and their
+# signal-based invalidation are shared across worker processes.
+# Set USE_LOCMEM_CACHE=True to run without Redis (per-process cache).
+if env.bool('USE_LOCMEM_CACHE', default=False):
     CACHES = {
         'default': {
             'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
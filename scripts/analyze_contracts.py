@@ -13,19 +13,29 @@ Usage:
 
 Environment acceleration (optional):
 - OCR_PAGES_MAX: limit OCR pages (e.g., 10)
-- OCR_DPI: rasterization DPI (default 400)
+- OCR_DPI: rasterization DPI (default 300)
 - OCR_CHUNK_SIZE: render OCR in chunks to reduce memory
 - OPENAI_API_KEY: if set, uses OpenAI for LLM; otherwise uses local LLM in LegalRAG
+- RAG_CACHE: on by default here (LLM results cached on disk, RAG_CACHE_TTL seconds)
+
+Files are analyzed in parallel worker processes (--workers, default: CPU count).
+With --rag the default is a single worker: each worker loads its own embedding
+model and vector store, and all of them share one LLM backend. Raise --workers
+only if memory and the LLM server (or API rate limit) can take it.
 """
 
 import os
 import sys
+import re
 import json
 import csv
 import time
 import argparse
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 
 # Ensure project root is on sys.path for ai_engine imports
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
@@ -36,25 +46,211 @@ if str(PROJECT_ROOT) not in sys.path:
 from ai_engine.ocr import OCRProcessor
 from ai_engine.parser import ContractParser, SectionType
 from ai_engine.compliance import LegalComplianceEngine, ComplianceIssue, IssueSeverity
-from ai_engine.risk_scoring import RiskScoringEngine
+from ai_engine.risk_scoring import RiskScoringEngine, ClauseAnalysis
 from ai_engine.rag import LegalRAG
 from ai_engine.spelling import SpellingChecker
 
+try:
+    import ahocorasick  # pyahocorasick, optional multi-pattern matcher
+except ImportError:  # pragma: no cover
+    ahocorasick = None
+
+try:
+    import orjson  # faster JSON writer, optional
+except ImportError:  # pragma: no cover
+    orjson = None
+
 SUPPORTED_EXTS = {'.pdf', '.doc', '.docx', '.jpg', '.jpeg', '.png', '.tiff', '.bmp', '.gif'}
 
+# Contract type keywords (same as ContractAnalysisPipeline._detect_contract_type)
+CONTRACT_TYPE_PATTERNS = {
+    'service': ['xizmat ko\'rsatish', 'оказание услуг', 'xizmatlar', 'услуги', 'сервис'],
+    'supply': ['mol yetkazib berish', 'поставка', 'yetkazib berish', 'mahsulot yetkazish', 'товар'],
+    'work': ['pudrat', 'подряд', 'qurilish', 'qurish', "ta'mirlash", 'строительство', 'ремонт', 'пудрат', 'қурилиш', 'курилиш', 'қуриш', 'иншоот', 'иншоат'],
+    'labor': ['mehnat shartnomasi', 'трудовой договор', 'ish haqi', 'заработная плата', 'xodim'],
+    'lease': ['ijara', 'аренда', 'ijaraga berish', 'ijaraga olish'],
+    'procurement': ['davlat xaridi', 'государственная закупка', 'tender', 'тендер', 'konkurs'],
+    'loan': ['qarz', 'займ', 'кредит', 'kredit', 'ssuda'],
+}
+
+
+def _build_type_automaton():
+    """Compile all contract type keywords into one Aho-Corasick automaton."""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for ctype, pats in CONTRACT_TYPE_PATTERNS.items():
+        for p in pats:
+            automaton.add_word(p, (ctype, p))
+    automaton.make_automaton()
+    return automaton
+
+
+def _build_type_regex():
+    """Compile all contract type keywords into one alternation (fallback without pyahocorasick).
+
+    The zero-width lookahead reports a match at every position, longest keyword
+    first, so keywords embedded in another one ('ijara' in 'ijaraga berish') are
+    credited through the dispatch table below.
+    """
+    pats = sorted({p for ps in CONTRACT_TYPE_PATTERNS.values() for p in ps}, key=len, reverse=True)
+    regex = re.compile('(?=(' + '|'.join(re.escape(p) for p in pats) + '))')
+    dispatch = {
+        p: {(ctype, q) for ctype, qs in CONTRACT_TYPE_PATTERNS.items() for q in qs if q in p}
+        for p in pats
+    }
+    return regex, dispatch
+
+
+# Built once at import, shared by every file in the batch
+_TYPE_AUTOMATON = _build_type_automaton()
+_TYPE_RE, _TYPE_DISPATCH = _build_type_regex()
+
+
+# Contract type is nearly always declared in the title/preamble
+TYPE_HEAD_CHARS = 3000
+
+
+def _score_contract_types(tl: str) -> Dict[str, int]:
+    scores = {k: 0 for k in CONTRACT_TYPE_PATTERNS}
+    if _TYPE_AUTOMATON is not None:
+        # Single pass over the text; each keyword still counts once
+        for ctype, _ in {value for _, value in _TYPE_AUTOMATON.iter(tl)}:
+            scores[ctype] += 1
+    else:
+        found = set()
+        for p in set(_TYPE_RE.findall(tl)):
+            found |= _TYPE_DISPATCH[p]
+        for ctype, _ in found:
+            scores[ctype] += 1
+    return scores
+
+
+def _detect_contract_type(text: str) -> str:
+    # Score the head first and only scan the whole text when it has no keyword
+    scores = _score_contract_types(text[:TYPE_HEAD_CHARS].lower())
+    if not any(scores.values()) and len(text) > TYPE_HEAD_CHARS:
+        scores = _score_contract_types(text.lower())
+    bt = max(scores.items(), key=lambda x: x[1])
+    return bt[0] if bt[1] > 0 else 'other'
+
+
+@lru_cache(maxsize=1)
+def _get_engines():
+    """Build the stateless AI engines once per process and reuse them for every file."""
+    return (
+        OCRProcessor(),
+        ContractParser(),
+        LegalComplianceEngine(),
+        RiskScoringEngine(),
+        SpellingChecker(),
+    )
+
+
+@lru_cache(maxsize=1)
+def _get_rag(llm_model: str, use_openai: bool) -> LegalRAG:
+    """Return the process-wide LegalRAG so each worker loads embeddings/vector store once."""
+    rag = LegalRAG(llm_model=llm_model, use_openai=use_openai, openai_model='gpt-3.5-turbo')
+    rag.initialize()
+    return rag
+
+
+def _init_worker(use_rag: bool, llm_model: str):
+    """ProcessPoolExecutor initializer: warm up engines once per worker, not per task."""
+    _get_engines()
+    if use_rag:
+        try:
+            _get_rag(llm_model, bool(os.environ.get('OPENAI_API_KEY')))
+        except Exception:
+            # analyze_file retries and falls back to no-RAG on failure
+            pass
+
 
 def find_files(input_dir: Path) -> List[Path]:
+    # os.scandir reuses the directory entry type, so no extra stat() per file
     files: List[Path] = []
-    for root, _, filenames in os.walk(input_dir):
-        for name in filenames:
-            p = Path(root) / name
-            if p.suffix.lower() in SUPPORTED_EXTS:
-                files.append(p)
+    stack = [str(input_dir)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir():
+                        # Like os.walk: list symlinked dirs but don't descend into them
+                        if not entry.is_symlink():
+                            stack.append(entry.path)
+                    elif os.path.splitext(entry.name)[1].lower() in SUPPORTED_EXTS:
+                        files.append(Path(entry.path))
+        except OSError:
+            # Like os.walk: skip directories that can't be read
+            continue
     return sorted(files)
 
 
+def _timed(fn, *args):
+    """Call fn(*args) and return (result, elapsed seconds)."""
+    t = time.time()
+    return fn(*args), time.time() - t
+
+
+def _rag_clause_analyses(rag: LegalRAG, sections, contract_type: str) -> Optional[Dict[str, ClauseAnalysis]]:
+    """Structured LLM analyses of key clauses for risk scoring, or None on failure."""
+    try:
+        key_sections = [SectionType.LIABILITY, SectionType.PRICE, SectionType.TERM, SectionType.FORCE_MAJEURE]
+        # Last section of each type wins, as before; all of them go to the LLM in one call
+        key_content = {
+            sec.section_type.value: sec.content for sec in sections if sec.section_type in key_sections
+        }
+        structured = rag.analyze_clauses_batch(
+            [(name, content[:800]) for name, content in key_content.items()], contract_type
+        )
+        clause_analyses = {}
+        for name, data in structured.items():
+            compliance = data.get('compliance', 'noaniq')
+            severity = 'critical' if compliance == 'mos emas' else 'medium'
+            clause_analyses[name] = ClauseAnalysis(
+                clause_text=key_content[name][:500],
+                compliance=compliance,
+                risks=list(data.get('risks', []))[:6],
+                recommendations=list(data.get('recommendations', []))[:6],
+                severity=severity,
+                suggested_text=data.get('rewrite', ''),
+            )
+        return clause_analyses
+    except Exception:
+        return None
+
+
+def _rag_explanations(rag: LegalRAG, text: str, sections, contract_type: str) -> Dict[str, Any]:
+    """Explanatory RAG output: relevant laws and per-section commentary."""
+    rag_details = {}
+    try:
+        relevant_laws = rag.search_laws(text[:2000], contract_type, n_results=8)
+        rag_details['relevant_laws'] = relevant_laws
+        key_sections = [SectionType.SUBJECT, SectionType.LIABILITY, SectionType.PRICE]
+        key_content = {
+            sec.section_type.value: sec.content[:800] for sec in sections if sec.section_type in key_sections
+        }
+        section_analyses = rag.explain_clauses_batch(list(key_content.items()), contract_type)
+        rag_details['section_analyses'] = section_analyses
+    except Exception as e:
+        rag_details['error'] = str(e)
+    return rag_details
+
+
+def _rag_passes(rag: LegalRAG, text: str, sections, contract_type: str):
+    """
+    Both RAG passes, one after the other: LegalRAG (embedder, vector store,
+    memo caches) is shared per process and not safe to use from two threads.
+    Returns ((clause_analyses, t_clauses), (rag_details, t_rag)).
+    """
+    return (
+        _timed(_rag_clause_analyses, rag, sections, contract_type),
+        _timed(_rag_explanations, rag, text, sections, contract_type),
+    )
+
+
 def analyze_file(
-    file_path: Path,
+    file_path: str,
     use_rag: bool = True,
     analyze_spelling: bool = False,
     llm_model: str = 'llama3.1'
@@ -62,23 +258,21 @@ def analyze_file(
     """
     Analyze a single file end-to-end without Django models.
     Returns (result_dict, metrics_dict).
+
+    Kept at module level (and taking a plain str path) so it can be
+    dispatched to ProcessPoolExecutor workers.
     """
+    file_path = Path(file_path)
     t0 = time.time()
-    ocr = OCRProcessor()
-    parser = ContractParser()
-    compliance = LegalComplianceEngine()
-    risk = RiskScoringEngine()
-    spell = SpellingChecker()
+    ocr, parser, compliance, risk, spell = _get_engines()
 
     # Optional RAG
     rag = None
     if use_rag:
         try:
-            import os as _os
-            use_openai = bool(_os.environ.get('OPENAI_API_KEY'))
-            rag = LegalRAG(llm_model=llm_model, use_openai=use_openai, openai_model='gpt-3.5-turbo')
-            rag.initialize()
+            rag = _get_rag(llm_model, bool(os.environ.get('OPENAI_API_KEY')))
         except Exception as e:
+            print(f"   ⚠️ RAG unavailable, analyzing {file_path.name} without it: {e}", file=sys.stderr)
             rag = None
 
     metrics = {
@@ -101,38 +295,27 @@ def analyze_file(
     metrics['t_parse'] = time.time() - t
 
     # 3) Detect contract type (reuse pipeline logic)
-    def _detect_contract_type(text: str) -> str:
-        tl = text.lower()
-        type_patterns = {
-            'service': ['xizmat ko\'rsatish', 'оказание услуг', 'xizmatlar', 'услуги', 'сервис'],
-            'supply': ['mol yetkazib berish', 'поставка', 'yetkazib berish', 'mahsulot yetkazish', 'товар'],
-            'work': ['pudrat', 'подряд', 'qurilish', 'qurish', "ta'mirlash", 'строительство', 'ремонт', 'пудрат', 'қурилиш', 'курилиш', 'қуриш', 'иншоот', 'иншоат'],
-            'labor': ['mehnat shartnomasi', 'трудовой договор', 'ish haqi', 'заработная плата', 'xodim'],
-            'lease': ['ijara', 'аренда', 'ijaraga berish', 'ijaraga olish'],
-            'procurement': ['davlat xaridi', 'государственная закупка', 'tender', 'тендер', 'konkurs'],
-            'loan': ['qarz', 'займ', 'кредит', 'kredit', 'ssuda'],
-        }
-        scores = {k: 0 for k in type_patterns}
-        for ctype, pats in type_patterns.items():
-            for p in pats:
-                if p in tl:
-                    scores[ctype] += 1
-        bt = max(scores.items(), key=lambda x: x[1])
-        return bt[0] if bt[1] > 0 else 'other'
-
     contract_type = _detect_contract_type(text)
 
-    # 4) Compliance
-    t = time.time()
-    issues = compliance.check_compliance(sections, metadata, contract_type)
-    metrics['t_compliance'] = time.time() - t
-
-    # 5) Spelling (optional)
-    spelling_errors = []
-    if analyze_spelling:
-        t = time.time()
-        spelling_errors = spell.check_text(text, metadata.language)
-        metrics['t_spelling'] = time.time() - t
+    # 4-7) Compliance, spelling and RAG only share the parsed input, so run
+    # them side by side; spelling and RAG mostly wait on HTTP. The two RAG
+    # passes stay in one task since they share the worker's LegalRAG.
+    with ThreadPoolExecutor(max_workers=3) as ex:
+        fut_c = ex.submit(_timed, compliance.check_compliance, sections, metadata, contract_type)
+        fut_s = ex.submit(_timed, spell.check_text, text, metadata.language) if analyze_spelling else None
+        fut_r = ex.submit(_rag_passes, rag, text, sections, contract_type) if rag else None
+
+        issues, metrics['t_compliance'] = fut_c.result()
+        spelling_errors = []
+        if fut_s:
+            spelling_errors, metrics['t_spelling'] = fut_s.result()
+        clause_analyses, t_clauses = None, 0.0
+        rag_details = {}
+        if fut_r:
+            (clause_analyses, t_clauses), (rag_details, metrics['t_rag']) = fut_r.result()
+
+    # 5) Spelling errors become low-severity issues
+    if spelling_errors:
         from ai_engine.compliance import IssueType
         for sp in spelling_errors:
             issues.append(
@@ -150,55 +333,14 @@ def analyze_file(
 
     # 6) Risk scoring with optional LLM structured analyses
     t = time.time()
-    clause_analyses = None
-    if rag:
-        try:
-            key_sections = [SectionType.LIABILITY, SectionType.PRICE, SectionType.TERM, SectionType.FORCE_MAJEURE]
-            clause_analyses = {}
-            for section in sections:
-                if section.section_type in key_sections:
-                    structured = rag.analyze_clause_structured(section.content[:800], contract_type)
-                    data = structured.get('analysis_structured', {})
-                    compliance = data.get('compliance', 'noaniq')
-                    severity = 'critical' if compliance == 'mos emas' else 'medium'
-                    from ai_engine.risk_scoring import ClauseAnalysis
-                    clause_analyses[section.section_type.value] = ClauseAnalysis(
-                        clause_text=section.content[:500],
-                        compliance=compliance,
-                        risks=list(data.get('risks', []))[:6],
-                        recommendations=list(data.get('recommendations', []))[:6],
-                        severity=severity,
-                        suggested_text=data.get('rewrite', ''),
-                    )
-        except Exception:
-            clause_analyses = None
     risk_score = risk.calculate_score(sections, metadata, issues, contract_type, clause_analyses)
-    metrics['t_risk'] = time.time() - t
-
-    # 7) Enhanced RAG analysis (explanatory)
-    rag_details = {}
-    if rag:
-        t = time.time()
-        try:
-            relevant_laws = rag.search_laws(text[:2000], contract_type, n_results=8)
-            rag_details['relevant_laws'] = relevant_laws
-            key_sections = [SectionType.SUBJECT, SectionType.LIABILITY, SectionType.PRICE]
-            section_analyses = {}
-            for section in sections:
-                if section.section_type in key_sections:
-                    analysis = rag.analyze_clause(section.content[:800], contract_type)
-                    section_analyses[section.section_type.value] = analysis.get('analysis', '')
-            rag_details['section_analyses'] = section_analyses
-        except Exception as e:
-            rag_details['error'] = str(e)
-        metrics['t_rag'] = time.time() - t
+    metrics['t_risk'] = time.time() - t + t_clauses
 
     # Aggregate issue counts
     by_severity = {
         'critical': 0, 'high': 0, 'medium': 0, 'low': 0, 'info': 0
     }
-    for i in issues:
-        by_severity[i.severity.value] = by_severity.get(i.severity.value, 0) + 1
+    by_severity.update(Counter(i.severity.value for i in issues))
 
     result = {
         'file': str(file_path),
@@ -237,54 +379,77 @@ def analyze_file(
     return result, metrics
 
 
-def write_outputs(results: List[Dict[str, Any]], metrics_list: List[Dict[str, Any]], out_dir: Path):
-    out_dir.mkdir(parents=True, exist_ok=True)
-    # Per-file JSON
-    for res in results:
-        fname = Path(res['filename']).stem + '.json'
-        with open(out_dir / fname, 'w', encoding='utf-8') as f:
-            json.dump(res, f, ensure_ascii=False, indent=2)
-    # Aggregated CSV
-    csv_path = out_dir / 'summary.csv'
-    fieldnames = [
-        'filename', 'contract_type', 'language', 'is_scanned', 'ocr_confidence',
-        'sections_count', 'overall', 'risk_level', 'compliance', 'completeness', 'clarity', 'balance',
-        'issues_critical', 'issues_high', 'issues_medium', 'issues_low', 'issues_info', 'processing_time',
-        't_ocr', 't_parse', 't_spelling', 't_compliance', 't_risk', 't_rag'
-    ]
-    with open(csv_path, 'w', newline='', encoding='utf-8') as f:
-        w = csv.DictWriter(f, fieldnames=fieldnames)
-        w.writeheader()
-        for res, m in zip(results, metrics_list):
-            scores = res.get('scores', {})
-            counts = res.get('issue_counts', {})
-            row = {
-                'filename': res.get('filename', ''),
-                'contract_type': res.get('contract_type', ''),
-                'language': res.get('language', ''),
-                'is_scanned': res.get('is_scanned', False),
-                'ocr_confidence': res.get('ocr_confidence', 0.0),
-                'sections_count': res.get('sections_count', 0),
-                'overall': scores.get('overall', 0),
-                'risk_level': scores.get('level', ''),
-                'compliance': scores.get('compliance', 0),
-                'completeness': scores.get('completeness', 0),
-                'clarity': scores.get('clarity', 0),
-                'balance': scores.get('balance', 0),
-                'issues_critical': counts.get('critical', 0),
-                'issues_high': counts.get('high', 0),
-                'issues_medium': counts.get('medium', 0),
-                'issues_low': counts.get('low', 0),
-                'issues_info': counts.get('info', 0),
-                'processing_time': res.get('processing_time', 0.0),
-                't_ocr': round(m.get('t_ocr', 0.0), 3),
-                't_parse': round(m.get('t_parse', 0.0), 3),
-                't_spelling': round(m.get('t_spelling', 0.0), 3),
-                't_compliance': round(m.get('t_compliance', 0.0), 3),
-                't_risk': round(m.get('t_risk', 0.0), 3),
-                't_rag': round(m.get('t_rag', 0.0), 3),
-            }
-            w.writerow(row)
+CSV_FIELDNAMES = [
+    'filename', 'contract_type', 'language', 'is_scanned', 'ocr_confidence',
+    'sections_count', 'overall', 'risk_level', 'compliance', 'completeness', 'clarity', 'balance',
+    'issues_critical', 'issues_high', 'issues_medium', 'issues_low', 'issues_info', 'processing_time',
+    't_ocr', 't_parse', 't_spelling', 't_compliance', 't_risk', 't_rag'
+]
+
+
+def write_one_json(res: Dict[str, Any], out_dir: Path):
+    """Write the per-file JSON result."""
+    fname = Path(res['filename']).stem + '.json'
+    if orjson is not None:
+        # orjson always emits UTF-8, matching ensure_ascii=False
+        (out_dir / fname).write_bytes(orjson.dumps(
+            res, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        ))
+        return
+    with open(out_dir / fname, 'w', encoding='utf-8') as f:
+        json.dump(res, f, ensure_ascii=False, indent=2)
+
+
+class CsvAppender:
+    """Aggregated CSV summary written one row at a time as files finish."""
+
+    def __init__(self, csv_path: Path, fieldnames: List[str] = CSV_FIELDNAMES):
+        self.csv_path = csv_path
+        self.fieldnames = fieldnames
+        self._file = None
+        self._writer = None
+
+    def __enter__(self) -> 'CsvAppender':
+        self._file = open(self.csv_path, 'w', newline='', encoding='utf-8')
+        self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames)
+        self._writer.writeheader()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._file.close()
+
+    def write_row(self, res: Dict[str, Any], m: Dict[str, Any]):
+        scores = res.get('scores', {})
+        counts = res.get('issue_counts', {})
+        row = {
+            'filename': res.get('filename', ''),
+            'contract_type': res.get('contract_type', ''),
+            'language': res.get('language', ''),
+            'is_scanned': res.get('is_scanned', False),
+            'ocr_confidence': res.get('ocr_confidence', 0.0),
+            'sections_count': res.get('sections_count', 0),
+            'overall': scores.get('overall', 0),
+            'risk_level': scores.get('level', ''),
+            'compliance': scores.get('compliance', 0),
+            'completeness': scores.get('completeness', 0),
+            'clarity': scores.get('clarity', 0),
+            'balance': scores.get('balance', 0),
+            'issues_critical': counts.get('critical', 0),
+            'issues_high': counts.get('high', 0),
+            'issues_medium': counts.get('medium', 0),
+            'issues_low': counts.get('low', 0),
+            'issues_info': counts.get('info', 0),
+            'processing_time': res.get('processing_time', 0.0),
+            't_ocr': round(m.get('t_ocr', 0.0), 3),
+            't_parse': round(m.get('t_parse', 0.0), 3),
+            't_spelling': round(m.get('t_spelling', 0.0), 3),
+            't_compliance': round(m.get('t_compliance', 0.0), 3),
+            't_risk': round(m.get('t_risk', 0.0), 3),
+            't_rag': round(m.get('t_rag', 0.0), 3),
+        }
+        self._writer.writerow(row)
+        # Keep the summary usable if the batch is interrupted
+        self._file.flush()
 
 
 def main():
@@ -293,11 +458,13 @@ def main():
     ap.add_argument('--out', '-o', default='media/reports/batch', help='Output folder for results')
     ap.add_argument('--rag', action='store_true', help='Enable RAG/LLM clause analysis for stronger content evaluation')
     ap.add_argument('--spelling', action='store_true', help='Enable spelling checks')
+    ap.add_argument('--llm-model', default='llama3.1', help='Local LLM model for LegalRAG')
     # OCR tuning flags (passed via env for ai_engine.ocr)
     ap.add_argument('--max-pages', type=int, default=0, help='Limit number of pages per PDF for OCR')
     ap.add_argument('--dpi', type=int, default=0, help='OCR rasterization DPI')
     # Processing limit
     ap.add_argument('--limit', type=int, default=0, help='Analyze only first N files')
+    ap.add_argument('--workers', '-j', type=int, default=0, help='Parallel worker processes (default: CPU count, or 1 with --rag)')
     args = ap.parse_args()
 
     input_dir = Path(args.input).resolve()
@@ -319,27 +486,47 @@ def main():
         os.environ['OCR_PAGES_MAX'] = str(args.max_pages)
     if args.dpi and args.dpi > 0:
         os.environ['OCR_DPI'] = str(args.dpi)
+    # Share LLM results between workers and runs through LegalRAG's disk cache
+    os.environ.setdefault('RAG_CACHE', '1')
 
     print(f"Found {len(files)} files. Starting analysis...\n")
 
-    results: List[Dict[str, Any]] = []
-    metrics_list: List[Dict[str, Any]] = []
+    if args.workers > 0:
+        workers = args.workers
+    elif args.rag:
+        # Every worker would load its own LegalRAG and queue on the same LLM
+        workers = 1
+    else:
+        workers = os.cpu_count() or 1
+    task = partial(analyze_file, use_rag=args.rag, analyze_spelling=args.spelling, llm_model=args.llm_model)
 
-    for idx, fp in enumerate(files, 1):
-        print(f"[{idx}/{len(files)}] Analyzing: {fp.name}")
-        try:
-            res, met = analyze_file(fp, use_rag=args.rag, analyze_spelling=args.spelling)
-            results.append(res)
-            metrics_list.append(met)
-        except Exception as e:
-            print(f"   ❌ Error: {e}")
-            # Write minimal error JSON for traceability
-            results.append({'filename': fp.name, 'file': str(fp), 'error': str(e)})
-            metrics_list.append({'t_ocr': 0, 't_parse': 0, 't_spelling': 0, 't_compliance': 0, 't_risk': 0, 't_rag': 0})
-
-    write_outputs(results, metrics_list, out_dir)
-
-    print(f"\n✓ Done. Results:\n  - JSON files in: {out_dir}\n  - Summary: {out_dir / 'summary.csv'}")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    n_ok = n_failed = 0
+
+    # Results are written as each file finishes, so memory stays flat
+    with CsvAppender(out_dir / 'summary.csv') as summary, ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(args.rag, args.llm_model),
+    ) as ex:
+        futures = {ex.submit(task, str(fp)): fp for fp in files}
+        for done, fut in enumerate(as_completed(futures), 1):
+            fp = futures.pop(fut)
+            print(f"[{done}/{len(files)}] Analyzed: {fp.name}")
+            try:
+                res, met = fut.result()
+                n_ok += 1
+            except Exception as e:
+                print(f"   ❌ Error: {e}")
+                # Write minimal error JSON for traceability
+                res = {'filename': fp.name, 'file': str(fp), 'error': str(e)}
+                met = {'t_ocr': 0, 't_parse': 0, 't_spelling': 0, 't_compliance': 0, 't_risk': 0, 't_rag': 0}
+                n_failed += 1
+            write_one_json(res, out_dir)
+            summary.write_row(res, met)
+            del res, met
+
+    print(f"\n✓ Done. {n_ok} analyzed, {n_failed} failed. Results:\n  - JSON files in: {out_dir}\n  - Summary: {out_dir / 'summary.csv'}")
 
 
 if __name__ == '__main__':
@@ -4,46 +4,143 @@ Simple benchmark to measure OCR + parsing quality on a PDF.
 
 Usage:
   python scripts/benchmark.py /path/to/file.pdf
+  python scripts/benchmark.py /path/to/file.pdf --ocr-workers 4
+  python scripts/benchmark.py /path/to/file.pdf --warmup 1 --iterations 5
+
+With --ocr-workers > 1 every page is rasterized and OCR'd in its own worker
+process. Tesseract's OpenMP threading is limited to one thread per process
+(OMP_THREAD_LIMIT=1), which scales better than several threads per process.
+
+The OCR processor and parser are built once and reused for every iteration;
+timings are reported as the median over --iterations runs. The OCR result
+cache is off by default here (OCR_CACHE=0) so repeated runs really OCR.
 """
 
+import os
+
+# Must be set before Tesseract is spawned; one thread per process
+os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+os.environ.setdefault('OCR_CACHE', '0')
+
+import argparse
+import io
+import statistics
 import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
+import pdfplumber
+from pdf2image import convert_from_path
+from PIL import Image
+
+try:
+    import fitz  # PyMuPDF, fallback renderer when poppler is missing
+except ImportError:
+    fitz = None
+
 from ai_engine.ocr import OCRProcessor
 from ai_engine.parser import ContractParser
 
 
+@lru_cache(maxsize=1)
+def _get_ocr():
+    """One OCRProcessor per worker process."""
+    return OCRProcessor()
+
+
+def _ocr_page(pdf_path, page_no):
+    """Worker: rasterize one PDF page and OCR it; returns (text, confidence)."""
+    ocr = _get_ocr()
+    images = []
+    try:
+        images = convert_from_path(pdf_path, dpi=ocr.ocr_dpi, first_page=page_no, last_page=page_no)
+    except Exception:
+        pass
+    if not images and fitz is not None:
+        # Render just this page; the OCR helper would rasterize the whole document
+        with fitz.open(pdf_path) as doc:
+            pix = doc[page_no - 1].get_pixmap(dpi=ocr.ocr_dpi)
+        images = [Image.open(io.BytesIO(pix.tobytes("png")))]
+    if not images:
+        return "", 0.0
+    return ocr._ocr_images(images)
+
+
+def ocr_pages_parallel(pdf_path, executor):
+    """OCR all pages of a PDF in a process pool; returns (text, avg_confidence, True)."""
+    with pdfplumber.open(pdf_path) as pdf:
+        n_pages = len(pdf.pages)
+    max_pages = _get_ocr().max_pages
+    if max_pages > 0:
+        n_pages = min(n_pages, max_pages)
+    pages = range(1, n_pages + 1)
+    results = list(executor.map(_ocr_page, [str(pdf_path)] * n_pages, pages))
+    text = _get_ocr()._normalize_text("\n".join(t for t, _ in results).strip())
+    confs = [c for _, c in results if c]
+    return text, (sum(confs) / len(confs) if confs else 0.0), True
+
+
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python scripts/benchmark.py /path/to/file.pdf")
-        sys.exit(1)
+    ap = argparse.ArgumentParser(description='Benchmark OCR + parsing on a PDF')
+    ap.add_argument('pdf', help='Path to a PDF file')
+    ap.add_argument('--ocr-workers', type=int, default=1,
+                    help='OCR pages in parallel processes (0 = half the CPUs; default 1 = normal pipeline)')
+    ap.add_argument('--iterations', '-n', type=int, default=1, help='Timed runs; the median is reported (default 1)')
+    ap.add_argument('--warmup', type=int, default=0, help='Untimed runs before measuring (default 0)')
+    args = ap.parse_args()
 
-    pdf_path = Path(sys.argv[1])
+    pdf_path = Path(args.pdf)
     if not pdf_path.exists():
         print(f"File not found: {pdf_path}")
         sys.exit(1)
+    workers = args.ocr_workers if args.ocr_workers > 0 else max(1, (os.cpu_count() or 2) // 2)
 
-    ocr = OCRProcessor()
-    t0 = time.time()
-    text, conf, scanned = ocr.extract_text_from_file(str(pdf_path))
-    t_ocr = time.time() - t0
-
+    ocr = _get_ocr()
     parser = ContractParser()
-    t1 = time.time()
-    sections, metadata = parser.parse(text)
-    t_parse = time.time() - t1
+
+    # The pool (and each worker's OCRProcessor) is reused across iterations
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+
+    def run_once():
+        t0 = time.time()
+        if executor:
+            result = ocr_pages_parallel(pdf_path, executor)
+        else:
+            result = ocr.extract_text_from_file(str(pdf_path))
+        t1 = time.time()
+        parsed = parser.parse(result[0])
+        return result, parsed, t1 - t0, time.time() - t1
+
+    # Warmup runs load Tesseract language data and fill OS caches; not timed
+    for _ in range(args.warmup):
+        run_once()
+
+    ocr_times, parse_times = [], []
+    for _ in range(max(1, args.iterations)):
+        (text, conf, scanned), (sections, metadata), t_ocr, t_parse = run_once()
+        ocr_times.append(t_ocr)
+        parse_times.append(t_parse)
+    if executor:
+        executor.shutdown()
+    t_ocr = statistics.median(ocr_times)
+    t_parse = statistics.median(parse_times)
 
     print({
         "file": str(pdf_path),
         "scanned": scanned,
         "ocr_confidence": round(conf, 3),
+        "ocr_workers": workers,
         "chars": len(text),
         "words": len(text.split()),
         "language": metadata.language,
         "sections_count": len(sections),
+        "iterations": len(ocr_times),
         "ocr_time_s": round(t_ocr, 2),
         "parse_time_s": round(t_parse, 2),
+        "ocr_time_min_s": round(min(ocr_times), 2),
+        "parse_time_min_s": round(min(parse_times), 2),
     })
 
     # Show found sections' titles
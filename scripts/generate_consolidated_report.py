@@ -2,25 +2,83 @@
 import argparse
 import json
 import os
-import glob
+from html import escape
+from pathlib import Path
 import csv
+import gzip
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from collections import Counter, defaultdict
 from statistics import mean
 
+try:
+    import orjson  # much faster parser for large batches, optional
+except ImportError:  # pragma: no cover
+    orjson = None
 
-def load_json_files(folder):
-    paths = sorted(glob.glob(os.path.join(folder, '*.json')))
-    docs = []
-    for p in paths:
+try:
+    import ijson  # streaming parser for very large per-document JSONs, optional
+except ImportError:  # pragma: no cover
+    ijson = None
+
+# Files above this size are streamed with ijson (when installed), keeping only DOC_KEYS
+STREAM_THRESHOLD = 1 << 20  # 1 MB
+
+
+def parse_json(raw):
+    if orjson is not None:
         try:
-            with open(p, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                # Attach file name for reference
-                data['__file_name'] = os.path.basename(p)
-                docs.append(data)
-        except Exception as e:
-            print(f"[WARN] Failed to load {p}: {e}")
-    return docs
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass  # e.g. NaN written by the stdlib encoder; let json decide
+    return json.loads(raw)
+
+
+def _load_one(path):
+    """Worker: parse one JSON file; returns (path, data, error)."""
+    try:
+        p = Path(path)
+        if ijson is not None and p.stat().st_size > STREAM_THRESHOLD:
+            with p.open('rb') as f:
+                if next(ijson.parse(f), (None, None))[1] != 'start_map':
+                    return path, None, "top-level JSON is not an object"
+                f.seek(0)
+                # Only one top-level value is materialized at a time; unused ones are dropped
+                data = {k: v for k, v in ijson.kvitems(f, '', use_float=True) if k in DOC_KEYS}
+        else:
+            # Bytes straight to orjson: no text decode pass before parsing
+            data = parse_json(p.read_bytes())
+    except Exception as e:
+        return path, None, e
+    if not isinstance(data, dict):
+        return path, None, "top-level JSON is not an object"
+    return path, data, None
+
+
+def iter_json_files(folder, workers=0):
+    """Yield parsed documents in file-name order as the loaders finish them."""
+    # Like glob('*.json'), but without fnmatch or per-entry stat; dotfiles are skipped as before
+    with os.scandir(folder) as it:
+        paths = sorted(
+            e.path for e in it
+            if e.name.endswith('.json') and not e.name.startswith('.') and e.is_file()
+        )
+    workers = workers if workers > 0 else (os.cpu_count() or 1)
+    if workers > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            yield from _attach_names(ex.map(_load_one, paths, chunksize=16))
+    else:
+        yield from _attach_names(map(_load_one, paths))
+
+
+def _attach_names(results):
+    for p, data, err in results:
+        if err is not None:
+            print(f"[WARN] Failed to load {p}: {err}")
+            continue
+        # Attach file name for reference
+        data['__file_name'] = os.path.basename(p)
+        yield data
 
 
 def safe_mean(values):
@@ -28,37 +86,47 @@ def safe_mean(values):
     return round(mean(values), 2) if values else None
 
 
+SCORE_KEYS = ['overall', 'compliance', 'completeness', 'clarity', 'balance', 'ambiguity', 'specificity']
+
+# Where each score may live, highest priority first: nested parents win over
+# flat top-level fields, and short names inside 'scores' are the last resort.
+SCORE_PATHS = [
+    (f'{k}_score', (
+        ('scores', f'{k}_score'),
+        ('analysis', f'{k}_score'),
+        ('result', f'{k}_score'),
+        ('risk', f'{k}_score'),
+        (f'{k}_score',),
+        ('scores', k),
+    ))
+    for k in SCORE_KEYS
+]
+
+
 def extract_scores(doc):
-    # Try multiple possible locations for scores
+    # Try multiple possible locations for scores; first numeric hit wins
     scores = {}
-    # Flat top-level fields
-    for k in ['overall_score', 'compliance_score', 'completeness_score', 'clarity_score', 'balance_score',
-              'ambiguity_score', 'specificity_score']:
-        if k in doc and isinstance(doc[k], (int, float)):
-            scores[k] = doc[k]
-
-    # Nested result/risk/scores structures
-    for parent in ['risk', 'result', 'analysis', 'scores']:
-        nested = doc.get(parent, {})
-        if isinstance(nested, dict):
-            for k in ['overall_score', 'compliance_score', 'completeness_score', 'clarity_score', 'balance_score',
-                      'ambiguity_score', 'specificity_score']:
-                if k in nested and isinstance(nested[k], (int, float)):
-                    scores[k] = nested[k]
-            # Also check for keys without '_score' suffix in 'scores' dict
-            if parent == 'scores':
-                for short_k in ['overall', 'compliance', 'completeness', 'clarity', 'balance', 'ambiguity', 'specificity']:
-                    long_k = f'{short_k}_score'
-                    if short_k in nested and isinstance(nested[short_k], (int, float)) and long_k not in scores:
-                        scores[long_k] = nested[short_k]
+    for out_key, paths in SCORE_PATHS:
+        for path in paths:
+            cur = doc
+            for key in path:
+                cur = cur.get(key) if isinstance(cur, dict) else None
+            if isinstance(cur, (int, float)):
+                scores[out_key] = cur
+                break
     return scores
 
 
 def extract_meta(doc):
     contract_type = doc.get('contract_type') or doc.get('type') or doc.get('document_type')
     language = doc.get('language') or doc.get('lang')
-    risk_level = doc.get('risk_level') or doc.get('risk', {}).get('level') or doc.get('scores', {}).get('level')
-    parties = doc.get('parties') or doc.get('metadata', {}).get('parties')
+    # No throwaway {} defaults: nested parents are only looked into when they are dicts
+    risk_level = (
+        doc.get('risk_level')
+        or (isinstance(risk := doc.get('risk'), dict) and risk.get('level'))
+        or (isinstance(sc := doc.get('scores'), dict) and sc.get('level'))
+    )
+    parties = doc.get('parties') or (isinstance(md := doc.get('metadata'), dict) and md.get('parties'))
     return {
         'contract_type': contract_type or 'unknown',
         'language': language or 'unknown',
@@ -106,9 +174,62 @@ def extract_risky_clauses(doc):
     return clauses
 
 
-def aggregate(docs):
+def extract_record(doc):
+    """Everything the aggregate/CSV/HTML stages need from one document, computed once."""
+    return {
+        'file': doc.get('__file_name', ''),
+        'scores': extract_scores(doc),
+        'meta': extract_meta(doc),
+        'issues_count': count_items(doc, ['issues', 'risks', 'risky_clauses', 'risk_items']),
+        'recommendations_count': count_items(doc, ['recommendations', 'advice', 'suggestions']),
+        'clauses': extract_risky_clauses(doc),
+    }
+
+
+# Top-level keys extract_record reads; anything else can be skipped when streaming
+DOC_KEYS = frozenset(
+    {path[0] for _, paths in SCORE_PATHS for path in paths}
+    | {'contract_type', 'type', 'document_type', 'language', 'lang', 'risk_level', 'risk', 'scores',
+       'parties', 'metadata'}
+    | {'issues', 'risks', 'risky_clauses', 'risk_items', 'recommendations', 'advice', 'suggestions'}
+)
+
+
+CSV_FIELDNAMES = [
+    'file', 'risk_level', 'contract_type', 'language',
+    'overall_score', 'compliance_score', 'completeness_score', 'clarity_score', 'balance_score',
+    'ambiguity_score', 'specificity_score', 'issues_count', 'recommendations_count'
+]
+
+
+def csv_row(r):
+    scores = r['scores']
+    meta = r['meta']
+    return {
+        'file': r['file'],
+        'risk_level': meta['risk_level'],
+        'contract_type': meta['contract_type'],
+        'language': meta['language'],
+        'overall_score': scores.get('overall_score'),
+        'compliance_score': scores.get('compliance_score'),
+        'completeness_score': scores.get('completeness_score'),
+        'clarity_score': scores.get('clarity_score'),
+        'balance_score': scores.get('balance_score'),
+        'ambiguity_score': scores.get('ambiguity_score'),
+        'specificity_score': scores.get('specificity_score'),
+        'issues_count': r['issues_count'],
+        'recommendations_count': r['recommendations_count'],
+    }
+
+
+def aggregate(records, csv_writer=None):
+    """Aggregate a stream of records, writing each CSV row as soon as its record arrives.
+
+    Records are kept (minus their clause texts) in agg['documents'] for the HTML table.
+    """
     agg = {
-        'count': len(docs),
+        'count': 0,
+        'documents': [],
         'risk_level_counts': Counter(),
         'by_type': defaultdict(list),
         'scores': defaultdict(list),
@@ -117,9 +238,12 @@ def aggregate(docs):
         'risky_clause_freq': Counter(),
     }
 
-    for d in docs:
-        scores = extract_scores(d)
-        meta = extract_meta(d)
+    for r in records:
+        scores = r['scores']
+        meta = r['meta']
+        agg['count'] += 1
+        if csv_writer is not None:
+            csv_writer.writerow(csv_row(r))
 
         agg['risk_level_counts'][meta['risk_level']] += 1
         if meta['contract_type']:
@@ -132,47 +256,20 @@ def aggregate(docs):
         if 'specificity_score' in scores:
             agg['specificity_scores'].append(scores['specificity_score'])
 
-        clauses = extract_risky_clauses(d)
-        for c in clauses:
-            # Normalize clause text for frequency
-            c_norm = ' '.join(c.split())[:200]
-            agg['risky_clause_freq'][c_norm] += 1
+        # Normalize clause text for frequency; Counter.update counts in C
+        agg['risky_clause_freq'].update(' '.join(c.split())[:200] for c in r.pop('clauses'))
+        agg['documents'].append(r)
 
     return agg
 
 
-def write_csv(docs, out_csv):
-    fieldnames = [
-        'file', 'risk_level', 'contract_type', 'language',
-        'overall_score', 'compliance_score', 'completeness_score', 'clarity_score', 'balance_score',
-        'ambiguity_score', 'specificity_score', 'issues_count', 'recommendations_count'
-    ]
-    with open(out_csv, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        for d in docs:
-            scores = extract_scores(d)
-            meta = extract_meta(d)
-            row = {
-                'file': d.get('__file_name', ''),
-                'risk_level': meta['risk_level'],
-                'contract_type': meta['contract_type'],
-                'language': meta['language'],
-                'overall_score': scores.get('overall_score'),
-                'compliance_score': scores.get('compliance_score'),
-                'completeness_score': scores.get('completeness_score'),
-                'clarity_score': scores.get('clarity_score'),
-                'balance_score': scores.get('balance_score'),
-                'ambiguity_score': scores.get('ambiguity_score'),
-                'specificity_score': scores.get('specificity_score'),
-                'issues_count': count_items(d, ['issues', 'risks', 'risky_clauses', 'risk_items']),
-                'recommendations_count': count_items(d, ['recommendations', 'advice', 'suggestions']),
-            }
-            writer.writerow(row)
-    print(f"[OK] Wrote CSV: {out_csv}")
+@lru_cache(maxsize=256)
+def esc_cached(s):
+    """Escape categorical values (risk level, type, language) that repeat across documents."""
+    return escape(s or '', quote=False)
 
 
-def write_html(agg, docs, out_html):
+def write_html(agg, records, out_html, compress=None):
     avg_overall = safe_mean(agg['scores'].get('overall_score', []))
     avg_ambiguity = safe_mean(agg['ambiguity_scores'])
     avg_specificity = safe_mean(agg['specificity_scores'])
@@ -180,86 +277,92 @@ def write_html(agg, docs, out_html):
     top_risky = agg['risky_clause_freq'].most_common(15)
 
     def esc(s):
-        return (s or '').replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-
-    html = []
-    html.append('<!DOCTYPE html>')
-    html.append('<html lang="en"><head><meta charset="utf-8">')
-    html.append('<title>Consolidated Contract Analysis Report</title>')
-    html.append('<style>body{font-family:system-ui,Arial,sans-serif;margin:24px;} h1,h2{margin:0 0 12px;} table{border-collapse:collapse;width:100%;} th,td{border:1px solid #ddd;padding:8px;font-size:14px;} th{background:#f6f6f6;text-align:left;} .grid{display:grid;grid-template-columns:repeat(3,1fr);gap:12px;margin-bottom:16px;} .card{border:1px solid #eee;padding:12px;border-radius:8px;background:#fafafa;} .muted{color:#666;}</style>')
-    html.append('</head><body>')
-    html.append('<h1>Consolidated Contract Analysis Report</h1>')
-
-    # Summary cards
-    html.append('<div class="grid">')
-    html.append(f'<div class="card"><h2>Total Documents</h2><div>{agg["count"]}</div></div>')
-    html.append(f'<div class="card"><h2>Avg Overall Score</h2><div>{avg_overall if avg_overall is not None else "N/A"}</div></div>')
-    html.append(f'<div class="card"><h2>Ambiguity / Specificity</h2><div>{avg_ambiguity if avg_ambiguity is not None else "N/A"} / {avg_specificity if avg_specificity is not None else "N/A"}</div></div>')
-    html.append('</div>')
-
-    # Risk levels
-    html.append('<h2>Risk Level Distribution</h2>')
-    html.append('<table><thead><tr><th>Risk Level</th><th>Count</th></tr></thead><tbody>')
-    for level, count in agg['risk_level_counts'].items():
-        html.append(f'<tr><td>{esc(level)}</td><td>{count}</td></tr>')
-    html.append('</tbody></table>')
-
-    # By type averages
-    html.append('<h2>Averages by Contract Type</h2>')
-    html.append('<table><thead><tr><th>Type</th><th>Avg Overall</th><th>Avg Ambiguity</th><th>Avg Specificity</th></tr></thead><tbody>')
-    for ctype, score_list in agg['by_type'].items():
-        overall_vals = [s.get('overall_score') for s in score_list if s.get('overall_score') is not None]
-        amb_vals = [s.get('ambiguity_score') for s in score_list if s.get('ambiguity_score') is not None]
-        spec_vals = [s.get('specificity_score') for s in score_list if s.get('specificity_score') is not None]
-        html.append('<tr>'
-                    f'<td>{esc(ctype)}</td>'
-                    f'<td>{safe_mean(overall_vals) if overall_vals else "N/A"}</td>'
-                    f'<td>{safe_mean(amb_vals) if amb_vals else "N/A"}</td>'
-                    f'<td>{safe_mean(spec_vals) if spec_vals else "N/A"}</td>'
-                    '</tr>')
-    html.append('</tbody></table>')
-
-    # Top risky clauses
-    html.append('<h2>Top Risky Clauses</h2>')
-    if top_risky:
-        html.append('<table><thead><tr><th>Clause (truncated)</th><th>Frequency</th></tr></thead><tbody>')
-        for text, freq in top_risky:
-            html.append(f'<tr><td class="muted">{esc(text)}</td><td>{freq}</td></tr>')
-        html.append('</tbody></table>')
+        # html.escape is implemented in C; quotes were never escaped here
+        return escape(s or '', quote=False)
+
+    if compress == 'gzip':
+        out_html += '.gz'
+        opener = gzip.open
     else:
-        html.append('<p class="muted">No risky clauses detected across documents.</p>')
-
-    # Detailed table
-    html.append('<h2>Per-Document Summary</h2>')
-    html.append('<table><thead><tr>'
-                '<th>File</th><th>Risk</th><th>Type</th><th>Lang</th>'
-                '<th>Overall</th><th>Compliance</th><th>Completeness</th><th>Clarity</th><th>Balance</th>'
-                '<th>Ambiguity</th><th>Specificity</th><th>Issues</th><th>Recommendations</th>'
-                '</tr></thead><tbody>')
-    for d in docs:
-        scores = extract_scores(d)
-        meta = extract_meta(d)
-        html.append('<tr>'
-                    f'<td>{esc(d.get("__file_name", ""))}</td>'
-                    f'<td>{esc(meta.get("risk_level"))}</td>'
-                    f'<td>{esc(meta.get("contract_type"))}</td>'
-                    f'<td>{esc(meta.get("language"))}</td>'
-                    f'<td>{scores.get("overall_score", "")}</td>'
-                    f'<td>{scores.get("compliance_score", "")}</td>'
-                    f'<td>{scores.get("completeness_score", "")}</td>'
-                    f'<td>{scores.get("clarity_score", "")}</td>'
-                    f'<td>{scores.get("balance_score", "")}</td>'
-                    f'<td>{scores.get("ambiguity_score", "")}</td>'
-                    f'<td>{scores.get("specificity_score", "")}</td>'
-                    f'<td>{count_items(d, ["issues", "risks", "risky_clauses", "risk_items"] )}</td>'
-                    f'<td>{count_items(d, ["recommendations", "advice", "suggestions"] )}</td>'
-                    '</tr>')
-    html.append('</tbody></table>')
-
-    html.append('</body></html>')
-
-    with open(out_html, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(html))
+        opener = open
+
+    # Written line by line straight to the file instead of joining one big string
+    with opener(out_html, 'wt', encoding='utf-8') as f:
+        out = f.write
+        out('<!DOCTYPE html>\n')
+        out('<html lang="en"><head><meta charset="utf-8">\n')
+        out('<title>Consolidated Contract Analysis Report</title>\n')
+        out('<style>body{font-family:system-ui,Arial,sans-serif;margin:24px;} h1,h2{margin:0 0 12px;} table{border-collapse:collapse;width:100%;} th,td{border:1px solid #ddd;padding:8px;font-size:14px;} th{background:#f6f6f6;text-align:left;} .grid{display:grid;grid-template-columns:repeat(3,1fr);gap:12px;margin-bottom:16px;} .card{border:1px solid #eee;padding:12px;border-radius:8px;background:#fafafa;} .muted{color:#666;}</style>\n')
+        out('</head><body>\n')
+        out('<h1>Consolidated Contract Analysis Report</h1>\n')
+
+        # Summary cards
+        out('<div class="grid">\n')
+        out(f'<div class="card"><h2>Total Documents</h2><div>{agg["count"]}</div></div>\n')
+        out(f'<div class="card"><h2>Avg Overall Score</h2><div>{avg_overall if avg_overall is not None else "N/A"}</div></div>\n')
+        out(f'<div class="card"><h2>Ambiguity / Specificity</h2><div>{avg_ambiguity if avg_ambiguity is not None else "N/A"} / {avg_specificity if avg_specificity is not None else "N/A"}</div></div>\n')
+        out('</div>\n')
+
+        # Risk levels
+        out('<h2>Risk Level Distribution</h2>\n')
+        out('<table><thead><tr><th>Risk Level</th><th>Count</th></tr></thead><tbody>\n')
+        for level, count in agg['risk_level_counts'].items():
+            out(f'<tr><td>{esc(level)}</td><td>{count}</td></tr>\n')
+        out('</tbody></table>\n')
+
+        # By type averages
+        out('<h2>Averages by Contract Type</h2>\n')
+        out('<table><thead><tr><th>Type</th><th>Avg Overall</th><th>Avg Ambiguity</th><th>Avg Specificity</th></tr></thead><tbody>\n')
+        for ctype, score_list in agg['by_type'].items():
+            overall_vals = [s.get('overall_score') for s in score_list if s.get('overall_score') is not None]
+            amb_vals = [s.get('ambiguity_score') for s in score_list if s.get('ambiguity_score') is not None]
+            spec_vals = [s.get('specificity_score') for s in score_list if s.get('specificity_score') is not None]
+            out('<tr>'
+                f'<td>{esc(ctype)}</td>'
+                f'<td>{safe_mean(overall_vals) if overall_vals else "N/A"}</td>'
+                f'<td>{safe_mean(amb_vals) if amb_vals else "N/A"}</td>'
+                f'<td>{safe_mean(spec_vals) if spec_vals else "N/A"}</td>'
+                '</tr>\n')
+        out('</tbody></table>\n')
+
+        # Top risky clauses
+        out('<h2>Top Risky Clauses</h2>\n')
+        if top_risky:
+            out('<table><thead><tr><th>Clause (truncated)</th><th>Frequency</th></tr></thead><tbody>\n')
+            for text, freq in top_risky:
+                out(f'<tr><td class="muted">{esc(text)}</td><td>{freq}</td></tr>\n')
+            out('</tbody></table>\n')
+        else:
+            out('<p class="muted">No risky clauses detected across documents.</p>\n')
+
+        # Detailed table
+        out('<h2>Per-Document Summary</h2>\n')
+        out('<table><thead><tr>'
+            '<th>File</th><th>Risk</th><th>Type</th><th>Lang</th>'
+            '<th>Overall</th><th>Compliance</th><th>Completeness</th><th>Clarity</th><th>Balance</th>'
+            '<th>Ambiguity</th><th>Specificity</th><th>Issues</th><th>Recommendations</th>'
+            '</tr></thead><tbody>\n')
+        for r in records:
+            scores = r['scores']
+            meta = r['meta']
+            out('<tr>'
+                f'<td>{esc(r["file"])}</td>'
+                f'<td>{esc_cached(meta.get("risk_level"))}</td>'
+                f'<td>{esc_cached(meta.get("contract_type"))}</td>'
+                f'<td>{esc_cached(meta.get("language"))}</td>'
+                f'<td>{scores.get("overall_score", "")}</td>'
+                f'<td>{scores.get("compliance_score", "")}</td>'
+                f'<td>{scores.get("completeness_score", "")}</td>'
+                f'<td>{scores.get("clarity_score", "")}</td>'
+                f'<td>{scores.get("balance_score", "")}</td>'
+                f'<td>{scores.get("ambiguity_score", "")}</td>'
+                f'<td>{scores.get("specificity_score", "")}</td>'
+                f'<td>{r["issues_count"]}</td>'
+                f'<td>{r["recommendations_count"]}</td>'
+                '</tr>\n')
+        out('</tbody></table>\n')
+
+        out('</body></html>')
     print(f"[OK] Wrote HTML: {out_html}")
 
 
@@ -268,20 +371,31 @@ def main():
     parser.add_argument('--input', required=True, help='Folder with per-file JSON outputs (e.g. media/reports/shartnomalar_batch)')
     parser.add_argument('--out-html', help='Output HTML path (default: <input>/consolidated.html)')
     parser.add_argument('--out-csv', help='Output CSV path (default: <input>/consolidated.csv)')
+    parser.add_argument('--workers', '-j', type=int, default=0, help='Parallel JSON loader processes (default: CPU count)')
+    parser.add_argument('--compress', choices=['gzip'], help='Compress the HTML report (writes <out-html>.gz)')
     args = parser.parse_args()
 
     in_dir = args.input
     out_html = args.out_html or os.path.join(in_dir, 'consolidated.html')
     out_csv = args.out_csv or os.path.join(in_dir, 'consolidated.csv')
 
-    docs = load_json_files(in_dir)
-    if not docs:
+    if not os.path.isdir(in_dir):
+        print(f"[ERROR] No JSON files found in {in_dir}")
+        return 2
+
+    # Single streaming pass: load -> extract -> CSV row + aggregation
+    records = (extract_record(d) for d in iter_json_files(in_dir, args.workers))
+    with open(out_csv, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDNAMES)
+        writer.writeheader()
+        agg = aggregate(records, writer)
+    if not agg['count']:
+        os.remove(out_csv)
         print(f"[ERROR] No JSON files found in {in_dir}")
         return 2
+    print(f"[OK] Wrote CSV: {out_csv}")
 
-    agg = aggregate(docs)
-    write_csv(docs, out_csv)
-    write_html(agg, docs, out_html)
+    write_html(agg, agg['documents'], out_html, args.compress)
     return 0
 
 
@@ -1,4 +1,6 @@
-import os, sys
+import os, re, sys
+from bisect import bisect_right
+from itertools import accumulate
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 from ai_engine.ocr import OCRProcessor
 from ai_engine.parser import ContractParser
@@ -19,16 +21,28 @@ if __name__ == '__main__':
     print('amount:', meta.total_amount, meta.currency)
     print('language:', meta.language)
 
-    # Debug: print windows around each INN
-    import re
+    # Debug: print windows around each INN.
+    # Strip separators once so each INN lookup is a plain str.find; `ends`
+    # maps compact offsets back to positions in the original text.
+    runs = [(m.start(), m.group()) for m in re.finditer(r"[^\s–-]+", text)]
+    compact = ''.join(run for _, run in runs)
+    ends = list(accumulate(len(run) for _, run in runs))
+
+    def to_text_pos(i):
+        if i >= len(compact):
+            return len(text)
+        k = bisect_right(ends, i)
+        return runs[k][0] + i - (ends[k - 1] if k else 0)
+
     def show_inn_window(inn):
         if not inn:
             return
-        inn_pat = ''.join([f"{d}[\\s–-]*" for d in inn])
-        m = re.search(inn_pat, text)
-        if m:
-            start = max(0, m.start() - 600)
-            end = min(len(text), m.end() + 600)
+        idx = compact.find(inn)
+        if idx != -1:
+            # Like the old regex, the match runs up to the next non-separator
+            m_start, m_end = to_text_pos(idx), to_text_pos(idx + len(inn))
+            start = max(0, m_start - 600)
+            end = min(len(text), m_end + 600)
             print(f"\n--- Window near INN {inn} ---\n")
             print(text[start:end])
             print("\n-----------------------------\n")
@@ -1,53 +1,161 @@
+import json
 import os
-from flask import Flask, request, jsonify
+import queue
+from contextlib import contextmanager
+from functools import lru_cache
+from flask import Flask, Response, abort, request, jsonify
 import hunspell
 
+from common import CYRILLIC_PATH, LATIN_PATH, detect_script
+
+try:
+    import orjson  # tezroq JSON o'qish/yozish, ixtiyoriy
+except ImportError:
+    orjson = None
+
+try:
+    from asgiref.wsgi import WsgiToAsgi  # uvicorn bilan ishga tushirish uchun, ixtiyoriy
+except ImportError:
+    WsgiToAsgi = None
+
 app = Flask(__name__)
 
-# Fayl yo'llari
-DICT_PATH = os.path.join(os.path.dirname(__file__), 'dict')
-LATIN_PATH = os.path.join(DICT_PATH, 'latin')
-CYRILLIC_PATH = os.path.join(DICT_PATH, 'cyrillic')
+# Hunspell obyektlari: har bir yozuv uchun bir nechta nusxa, Waitress oqimlari
+# bitta native obyektni navbat kutmasdan ishlatishi uchun. uvicorn rejimida har bir
+# jarayon so'rovlarni bitta oqimda bajaradi, shuning uchun bitta nusxa yetarli.
+UZSPELL_SERVER = os.environ.get('UZSPELL_SERVER', 'waitress')
+HUNSPELL_POOL_SIZE = int(os.environ.get('HUNSPELL_POOL_SIZE', 1 if UZSPELL_SERVER == 'uvicorn' else 4))
+# /api/spell_batch bitta so'rovidagi so'zlar soni chegarasi
+MAX_BATCH_WORDS = int(os.environ.get('UZSPELL_MAX_BATCH_WORDS', 10000))
+
+def _make_pool(dic_path, aff_path):
+    pool = queue.Queue()
+    for _ in range(HUNSPELL_POOL_SIZE):
+        pool.put(hunspell.HunSpell(dic_path, aff_path))
+    return pool
 
-# Hunspell obyektlari
-hunspell_latin = hunspell.HunSpell(
+HUNSPELL_POOL_LATIN = _make_pool(
     os.path.join(LATIN_PATH, 'uz_UZ.dic'),
     os.path.join(LATIN_PATH, 'uz_UZ.aff')
 )
-hunspell_cyrillic = hunspell.HunSpell(
+HUNSPELL_POOL_CYRILLIC = _make_pool(
     os.path.join(CYRILLIC_PATH, 'uz_UZ_Cyrl.dic'),
     os.path.join(CYRILLIC_PATH, 'uz_UZ_Cyrl.aff')
 )
-def detect_script(word):
-    # Kirill harflari: U+0400 ... U+04FF
-    for ch in word:
-        if '\u0400' <= ch <= '\u04FF':
-            return 'cyrillic'
-    return 'latin'
 
-@app.route('/api/spell', methods=['POST'])
-def spell_check():
-    data = request.get_json(force=True)
-    word = data.get('word', '').strip()
-    script = data.get('script', None)
-    if not word:
-        return jsonify({'error': 'word required'}), 400
+def _load_known_words(dic_path):
+    # .dic o'zaklari (bayroqlarsiz); aniq mos kelgan so'z Hunspell'siz to'g'ri hisoblanadi
+    with open(dic_path, encoding='utf-8') as f:
+        next(f, None)  # birinchi qator: so'zlar soni
+        return frozenset(line.split(None, 1)[0].split('/', 1)[0] for line in f if line.strip())
+
+KNOWN_LATIN = _load_known_words(os.path.join(LATIN_PATH, 'uz_UZ.dic'))
+KNOWN_CYRILLIC = _load_known_words(os.path.join(CYRILLIC_PATH, 'uz_UZ_Cyrl.dic'))
+
+@contextmanager
+def _borrow(pool):
+    # Bo'sh nusxa bo'lmasa kutadi (navbat semafor vazifasini bajaradi)
+    checker = pool.get()
+    try:
+        yield checker
+    finally:
+        pool.put(checker)
+
+@lru_cache(maxsize=100000)
+def _spell_cached(script, word):
+    # spell/suggest faqat so'zga bog'liq: tez-tez uchraydigan so'zlar qayta tekshirilmaydi
+    pool = HUNSPELL_POOL_LATIN if script == 'latin' else HUNSPELL_POOL_CYRILLIC
+    with _borrow(pool) as checker:
+        # Ba'zi binding'lar int qaytaradi; JSON'da doim true/false bo'lsin
+        correct = bool(checker.spell(word))
+        # suggest() qimmat (tahrir masofasi bo'yicha qidiruv): faqat xato so'zlar uchun
+        return correct, (() if correct else tuple(checker.suggest(word)))
+
+def _read_json():
+    if orjson is None:
+        return request.get_json(force=True)
+    try:
+        return orjson.loads(request.get_data() or b'{}')
+    except orjson.JSONDecodeError:
+        abort(400)
+
+def _json_response(payload, status=200):
+    if orjson is None:
+        return jsonify(payload), status
+    return Response(orjson.dumps(payload), status=status, mimetype='application/json')
+
+def _dumps_line(payload):
+    if orjson is None:
+        return json.dumps(payload, ensure_ascii=False).encode('utf-8') + b'\n'
+    return orjson.dumps(payload) + b'\n'
+
+def _check_one(word, script=None):
     # Avtomatik aniqlash
     if not script:
         script = detect_script(word)
-    if script == 'latin':
-        checker = hunspell_latin
+    if word in (KNOWN_LATIN if script == 'latin' else KNOWN_CYRILLIC):
+        # Lug'atdagi so'z: native chaqiruvsiz
+        correct, suggestions = True, ()
     else:
-        checker = hunspell_cyrillic
-    correct = checker.spell(word)
-    suggestions = checker.suggest(word)
-    return jsonify({
+        correct, suggestions = _spell_cached('latin' if script == 'latin' else 'cyrillic', word)
+    return {
         'word': word,
         'script': script,
         'correct': correct,
-        'suggestions': suggestions
-    })
+        'suggestions': list(suggestions)
+    }
+
+def _check_item(item, script=None):
+    # Batch elementi: yaroqsiz element tashlab yuborilmaydi, o'rnida xato qaytadi
+    word = item.strip() if isinstance(item, str) else ''
+    if not word:
+        return {'word': item, 'error': 'word must be a non-empty string'}
+    return _check_one(word, script)
+
+@app.route('/api/spell', methods=['POST'])
+def spell_check():
+    data = _read_json()
+    word = data.get('word', '').strip()
+    script = data.get('script', None)
+    if not word:
+        return _json_response({'error': 'word required'}, 400)
+    return _json_response(_check_one(word, script))
+
+@app.route('/api/spell_batch', methods=['POST'])
+def spell_check_batch():
+    # Butun matn so'zlari bitta so'rovda: {"words": [...], "script": ixtiyoriy}
+    data = _read_json()
+    words = data.get('words')
+    script = data.get('script', None)
+    if not isinstance(words, list):
+        return _json_response({'error': 'words list required'}, 400)
+    if len(words) > MAX_BATCH_WORDS:
+        return _json_response({'error': f'too many words (max {MAX_BATCH_WORDS})'}, 400)
+    # Natijalar kiritilgan tartibda, har bir element uchun bittadan qaytariladi
+    if request.accept_mimetypes.best == 'application/x-ndjson':
+        # Har bir so'z natijasi tayyor bo'lishi bilan alohida qatorda yuboriladi
+        def generate():
+            for item in words:
+                yield _dumps_line(_check_item(item, script))
+        return Response(generate(), mimetype='application/x-ndjson')
+    return _json_response({'results': [_check_item(item, script) for item in words]})
+
+# ASGI ilova: UZSPELL_SERVER=uvicorn uvicorn app:asgi_app --port 4000 --workers N
+asgi_app = WsgiToAsgi(app) if WsgiToAsgi is not None else None
 
 if __name__ == '__main__':
-    from waitress import serve
-    serve(app, host='0.0.0.0', port=4000)
+    if UZSPELL_SERVER == 'uvicorn':
+        if asgi_app is None:
+            raise SystemExit("UZSPELL_SERVER=uvicorn requires asgiref and uvicorn: pip install asgiref uvicorn")
+        import uvicorn
+        # WSGI ilova ASGI ichida bitta oqimda bajariladi: parallellik jarayonlar hisobiga
+        uvicorn.run(
+            'app:asgi_app',
+            host='0.0.0.0',
+            port=4000,
+            workers=int(os.environ.get('UZSPELL_WORKERS', os.cpu_count() or 1)),
+            app_dir=os.path.dirname(os.path.abspath(__file__)),
+        )
+    else:
+        from waitress import serve
+        serve(app, host='0.0.0.0', port=4000, threads=HUNSPELL_POOL_SIZE)
@@ -0,0 +1,103 @@
+"""
+Katta matnlarni oflayn imlo tekshirish (Flask xizmatisiz).
+
+Har bir jarayon o'z Hunspell obyektlarini yuklaydi (bitta HunSpell'ni oqimlar
+orasida bo'lishib bo'lmaydi); noyob so'zlar jarayonlarga bo'lakma-bo'lak
+taqsimlanadi. Natija: xato so'zlar NDJSON ko'rinishida (stdout yoki --output).
+
+Usage:
+  python check_batch.py matn1.txt matn2.txt
+  python check_batch.py korpus/*.txt --workers 8 --all --output natija.ndjson
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from collections import Counter
+from multiprocessing import Pool
+
+from common import CYRILLIC_PATH, LATIN_PATH, detect_script
+
+# So'z: faqat harflar (raqam va _ emas, ular bilan yopishgan bo'laklar ham olinmaydi);
+# ichida apostrof yoki defis bo'lishi mumkin
+_WORD_RE = re.compile(r"(?<!\w)[^\W\d_]+(?:['ʻʼ‘’-][^\W\d_]+)*(?!\w)")
+
+_checkers = None
+
+
+def _init_worker():
+    # Har bir jarayonda bir marta
+    global _checkers
+    import hunspell
+    _checkers = {
+        'latin': hunspell.HunSpell(
+            os.path.join(LATIN_PATH, 'uz_UZ.dic'),
+            os.path.join(LATIN_PATH, 'uz_UZ.aff')
+        ),
+        'cyrillic': hunspell.HunSpell(
+            os.path.join(CYRILLIC_PATH, 'uz_UZ_Cyrl.dic'),
+            os.path.join(CYRILLIC_PATH, 'uz_UZ_Cyrl.aff')
+        ),
+    }
+
+
+def _check_word(word):
+    script = detect_script(word)
+    checker = _checkers[script]
+    correct = bool(checker.spell(word))
+    return {
+        'word': word,
+        'script': script,
+        'correct': correct,
+        'suggestions': [] if correct else checker.suggest(word),
+    }
+
+
+def count_words(paths):
+    """So'zlar chastotasi; har bir noyob so'z faqat bir marta tekshiriladi."""
+    counts = Counter()
+    for path in paths:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            for line in f:
+                counts.update(_WORD_RE.findall(line))
+    return counts
+
+
+def main():
+    ap = argparse.ArgumentParser(description='Bulk offline Uzbek spell check with Hunspell')
+    ap.add_argument('files', nargs='+', help='UTF-8 text files')
+    ap.add_argument('--workers', '-j', type=int, default=0, help='Worker processes (default: CPU count)')
+    ap.add_argument('--chunksize', type=int, default=1024, help='Words sent to a worker at a time (default 1024)')
+    ap.add_argument('--all', action='store_true', help='Also output correctly spelled words')
+    ap.add_argument('--output', '-o', help='NDJSON output file (default: stdout)')
+    args = ap.parse_args()
+
+    counts = count_words(args.files)
+    if not counts:
+        print('[ERROR] No words found', file=sys.stderr)
+        return 2
+
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    n_wrong = 0
+    try:
+        with Pool(args.workers or None, initializer=_init_worker) as pool:
+            # Tartib muhim emas: natijalar tayyor bo'lishi bilan yoziladi
+            for result in pool.imap_unordered(_check_word, counts, chunksize=max(1, args.chunksize)):
+                if not result['correct']:
+                    n_wrong += 1
+                elif not args.all:
+                    continue
+                result['count'] = counts[result['word']]
+                out.write(json.dumps(result, ensure_ascii=False) + '\n')
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    print(f'[OK] {len(counts)} unique words checked, {n_wrong} misspelled', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,21 @@
+"""
+app.py va check_batch.py uchun umumiy: lug'at yo'llari va yozuvni aniqlash.
+
+Alohida modulda, chunki app.py import qilinganda Flask ilovasi va Hunspell
+pullari yuklanadi; check_batch.py jarayonlariga ular kerak emas.
+"""
+
+import os
+import re
+
+# Fayl yo'llari
+DICT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dict')
+LATIN_PATH = os.path.join(DICT_PATH, 'latin')
+CYRILLIC_PATH = os.path.join(DICT_PATH, 'cyrillic')
+
+# Kirill harflari: U+0400 ... U+04FF
+_CYRILLIC_RE = re.compile('[\u0400-\u04FF]')
+
+
+def detect_script(word):
+    return 'cyrillic' if _CYRILLIC_RE.search(word) else 'latin'
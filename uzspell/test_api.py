@@ -1,13 +1,18 @@
 import requests
+from requests.adapters import HTTPAdapter
+
+# Bitta keep-alive ulanish barcha so'rovlar uchun
+SESSION = requests.Session()
+SESSION.mount('http://', HTTPAdapter(pool_connections=10, pool_maxsize=10))
 
 # Lotin test
-resp = requests.post('http://localhost:5005/api/spell', json={'word': 'xato'})
+resp = SESSION.post('http://localhost:5005/api/spell', json={'word': 'xato'})
 print('Lotin:', resp.json())
 
 # Kirill test
-resp = requests.post('http://localhost:5005/api/spell', json={'word': 'хатолик'})
+resp = SESSION.post('http://localhost:5005/api/spell', json={'word': 'хатолик'})
 print('Kirill:', resp.json())
 
 # Avto-detect test
-resp = requests.post('http://localhost:5005/api/spell', json={'word': 'kitob'})
+resp = SESSION.post('http://localhost:5005/api/spell', json={'word': 'kitob'})
 print('Avto-detect:', resp.json())
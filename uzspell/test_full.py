@@ -1,4 +1,11 @@
-import requests
+import asyncio
+import json
+import re
+
+import httpx
+
+UZSPELL_BATCH_URL = 'http://localhost:4000/api/spell_batch'
+YANDEX_URL = 'https://speller.yandex.net/services/spellservice.json/checkText'
 
 # Matn test (lotin, kirill, ruscha)
 matnlar = [
@@ -7,12 +14,50 @@ matnlar = [
     "Превет мир ошибка"          # ruscha
 ]
 
-for matn in matnlar:
-    print(f"\nMatn: {matn}")
-    for word in matn.split():
-        # Uzspell API
-        uzspell = requests.post('http://localhost:4000/api/spell', json={'word': word})
-        print(f"  Uzspell: {word} -> {uzspell.json()}")
-        # Yandex Speller (ruscha)
-        yandex = requests.get('https://speller.yandex.net/services/spellservice.json/checkText', params={'text': word})
-        print(f"  Yandex: {word} -> {yandex.json()}")
+
+async def uzspell_batch(client, words):
+    # NDJSON: har bir so'z natijasi alohida qatorda, kelishi bilan o'qiladi
+    results = []
+    headers = {'Accept': 'application/x-ndjson'}
+    async with client.stream('POST', UZSPELL_BATCH_URL, json={'words': words}, headers=headers) as resp:
+        async for line in resp.aiter_lines():
+            if line:
+                results.append(json.loads(line))
+    return results
+
+
+def yandex_by_word(matn, errors):
+    # Yandex xatolari (pos, len) bo'yicha so'zlarga ajratiladi: har bir so'z uchun
+    # avvalgi so'zma-so'z so'rov javobi bilan bir xil ro'yxat
+    result = []
+    for m in re.finditer(r'\S+', matn):
+        result.append([e for e in errors if m.start() <= e['pos'] < m.end()])
+    return result
+
+
+async def check_text(client, matn):
+    words = matn.split()
+    # Uzspell va Yandex: har biri butun matn uchun bitta so'rov, ikkalasi bir vaqtda
+    uzspell, yandex = await asyncio.gather(
+        uzspell_batch(client, words),
+        client.get(YANDEX_URL, params={'text': matn}),
+    )
+    return matn, words, uzspell, yandex_by_word(matn, yandex.json())
+
+
+async def main():
+    limits = httpx.Limits(max_connections=32)
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        results = await asyncio.gather(*[check_text(client, matn) for matn in matnlar])
+    # Natijalar matnlar tartibida chiqariladi
+    for matn, words, uzspell, yandex in results:
+        print(f"\nMatn: {matn}")
+        for result in uzspell:
+            print(f"  Uzspell: {result['word']} -> {result}")
+        for word, errors in zip(words, yandex):
+            # Yandex Speller (ruscha)
+            print(f"  Yandex: {word} -> {errors}")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())